@@ -0,0 +1,105 @@
+# alternatives.py
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+import config
+import optimizer
+from run_report import RunReport
+
+
+@dataclass
+class Alternative:
+    """One of the best rosters found, with its penalty split per WEIGHTS key."""
+    rank: int
+    objective: float
+    status: str
+    # (employees x days x shifts) uint8 array
+    assignment: np.ndarray
+    breakdown: Dict[str, float] = field(default_factory=dict)
+    # Cells that differ from the best roster (0 for the best one)
+    difference: int = 0
+
+    @property
+    def title(self):
+        return f"Roster {self.rank + 1}"
+
+
+def add_no_good(model, shift_vars, assignment, min_difference):
+    """Forbids every roster that differs from 'assignment' in fewer than 'min_difference' free cells."""
+    changed = [var.Not() if assignment[key] else var
+               for key, var in shift_vars.items() if not optimizer.is_fixed(var)]
+    model.Add(cp_model.LinearExpr.Sum(changed) >= min_difference)
+
+
+def find_alternatives(employees, count, max_gap=None, min_difference=None,
+                      solve_options: Optional[optimizer.SolveOptions] = None, report=None) -> List[Alternative]:
+    """
+    The 'count' best distinct rosters whose penalty is at most 'max_gap' (default
+    config.ALTERNATIVES_MAX_GAP) above the best one, in order of penalty.
+
+    The model is built once. After each solve a no-good cut excludes every roster within
+    'min_difference' cells (default config.ALTERNATIVES_MIN_DIFFERENCE) of the one just
+    found, the objective is capped at best + max_gap, and the model is re-solved without
+    hints (each roster found so far is excluded by its own cut). Rosters that only swap
+    interchangeable employees are already pruned by symmetry breaking, so every
+    alternative is a genuinely different plan.
+    Stops early once no roster within the gap is left (or a solve runs out of time).
+    """
+    max_gap = config.ALTERNATIVES_MAX_GAP if max_gap is None else max_gap
+    min_difference = min_difference or config.ALTERNATIVES_MIN_DIFFERENCE
+    report = report or RunReport()
+    num_days, num_shifts = config.NUM_DAYS, config.NUM_SHIFTS
+
+    with report.phase('build'):
+        model, shift_vars, objective_terms = optimizer.build_model_terms(employees, report=report)
+        with report.phase('objective'):
+            objective = optimizer.objective_expression(objective_terms)
+            model.Minimize(objective)
+    report.record_model(model)
+
+    alternatives = []
+    while len(alternatives) < count:
+        with report.phase('solve'):
+            solver, status = optimizer.solve(model, solve_options)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            break
+
+        assignment = optimizer.solution_array(solver, shift_vars, len(employees), num_days, num_shifts)
+        best = alternatives[0].assignment if alternatives else assignment
+        alternatives.append(Alternative(
+            rank=len(alternatives),
+            objective=solver.ObjectiveValue(),
+            status=solver.StatusName(status),
+            assignment=assignment,
+            breakdown=optimizer.penalty_breakdown(solver, objective_terms),
+            difference=int((assignment != best).sum())
+        ))
+        print(f"  Roster {len(alternatives)}: penalty {solver.ObjectiveValue():g} "
+              f"({solver.StatusName(status)}, {solver.WallTime():.2f}s)")
+
+        if len(alternatives) == 1:
+            model.Add(objective <= int(solver.ObjectiveValue()) + max_gap)
+        add_no_good(model, shift_vars, assignment, min_difference)
+        # Every roster found so far now violates its own cut, so none of them is a useful hint
+        model.ClearHints()
+
+    report.details['alternatives'] = [
+        {'roster': alt.title, 'objective': alt.objective, 'status': alt.status,
+         'difference': alt.difference, 'breakdown': alt.breakdown}
+        for alt in alternatives
+    ]
+    return alternatives
+
+
+def print_alternatives(alternatives):
+    if not alternatives:
+        print("❌ No roster found.")
+        return
+    keys = sorted({key for alt in alternatives for key in alt.breakdown})
+    print(f"\n{'Roster':<10}{'Penalty':>9}{'Changed':>9}" + "".join(f" {key:>18}" for key in keys))
+    for alt in alternatives:
+        print(f"{alt.title:<10}{alt.objective:>9g}{alt.difference:>9}"
+              + "".join(f" {alt.breakdown.get(key, 0):>18g}" for key in keys))
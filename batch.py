@@ -0,0 +1,127 @@
+# batch.py
+import csv
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ortools.sat.python import cp_model
+
+import config
+import export_writer
+import feasibility
+import optimizer
+from instance_io import instance_settings, load_instance
+from run_report import RunReport, report_path_for
+
+
+def plan_workers(num_jobs, processes=None, total_cores=None):
+    """
+    Splits the machine between concurrent jobs: returns (processes, CP-SAT workers per job)
+    so that processes * workers roughly matches the number of cores.
+    """
+    total_cores = total_cores or os.cpu_count() or 1
+    processes = max(1, min(processes or total_cores, num_jobs, total_cores))
+    return processes, max(1, total_cores // processes)
+
+
+def solve_team(instance_path, output_dir, num_workers, max_time_seconds, formats=('xlsx',)):
+    """Solves one team file in a worker process and returns its summary row."""
+    instance = load_instance(instance_path)
+    output_prefix = os.path.join(output_dir, instance.name)
+    output_path = f"{output_prefix}.xlsx"
+    report = RunReport()
+    start = time.perf_counter()
+
+    row = {
+        'team': instance.name,
+        'employees': sum(1 for emp in instance.employees if emp.is_active),
+        'status': None,
+        'objective': None,
+        'seconds': None,
+        'output': None
+    }
+
+    with instance_settings(instance):
+        findings = feasibility.check_feasibility(instance.employees)
+        if findings:
+            report.details['precheck'] = [str(finding) for finding in findings]
+            row['status'] = 'PRECHECK_FAILED'
+        else:
+            options = optimizer.SolveOptions(num_workers=num_workers, max_time_seconds=max_time_seconds)
+            solver, status, shift_vars = optimizer.build_and_solve_model(
+                instance.employees, solve_options=options, report=report
+            )
+            row['status'] = solver.StatusName(status)
+
+            if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                row['objective'] = solver.ObjectiveValue()
+                paths = export_writer.write_outputs(
+                    formats,
+                    solver=solver,
+                    shift_vars=shift_vars,
+                    employees=instance.employees,
+                    num_days=instance.num_days,
+                    num_shifts=instance.num_shifts,
+                    xlsx_path=output_path,
+                    output_prefix=output_prefix,
+                    report=report
+                )
+                row['output'] = ';'.join(paths)
+
+    report.write(report_path_for(output_path))
+    row['seconds'] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def run_batch(instances_dir, output_dir, processes=None, max_time_seconds=None, formats=None):
+    """
+    Solves every *.json team file in 'instances_dir' concurrently, writing the
+    schedule (in 'formats', default config.OUTPUT_FORMATS) + run report per team
+    and a summary.csv into 'output_dir'.
+    """
+    paths = sorted(glob.glob(os.path.join(instances_dir, '*.json')))
+    if not paths:
+        print(f"❌ Error: No team files (*.json) found in '{instances_dir}'")
+        return []
+
+    os.makedirs(output_dir, exist_ok=True)
+    max_time_seconds = max_time_seconds or config.SOLVER_MAX_TIME_SECONDS
+    formats = tuple(formats or config.OUTPUT_FORMATS)
+    processes, workers_per_job = plan_workers(len(paths), processes)
+    print(f"--- Solving {len(paths)} teams with {processes} processes x {workers_per_job} CP-SAT workers ---")
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {
+            pool.submit(solve_team, path, output_dir, workers_per_job, max_time_seconds, formats): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                row = future.result()
+            except Exception as e:
+                row = {'team': os.path.basename(path), 'employees': None, 'status': f'ERROR: {e}',
+                       'objective': None, 'seconds': None, 'output': None}
+            rows.append(row)
+            print(f"  {row['team']:<24} {row['status']:<16} penalty: {row['objective']}")
+
+    rows.sort(key=lambda r: r['team'])
+    summary_path = os.path.join(output_dir, 'summary.csv')
+    with open(summary_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print_summary(rows)
+    print(f"✅ Batch summary written to '{summary_path}'.")
+    return rows
+
+
+def print_summary(rows):
+    print(f"\n{'Team':<24}{'Employees':>10}  {'Status':<16}{'Penalty':>10}{'Seconds':>10}")
+    for row in rows:
+        objective = '-' if row['objective'] is None else f"{row['objective']:g}"
+        seconds = '-' if row['seconds'] is None else f"{row['seconds']:.2f}"
+        print(f"{row['team']:<24}{str(row['employees']):>10}  {row['status']:<16}{objective:>10}{seconds:>10}")
@@ -0,0 +1,7 @@
+# benchmarks/__init__.py
+"""
+Synthetic instances and a timing harness for the scheduler.
+
+    python -m benchmarks.runner --sizes 10,50,100 --output bench_results.json
+"""
+from benchmarks.generator import generate_instance
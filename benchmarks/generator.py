@@ -0,0 +1,91 @@
+# benchmarks/generator.py
+import random
+
+import shift_structure
+from instance_io import TeamInstance
+from models import ContactDetails, Employee, ShiftPreferences, WeeklyState
+
+
+def _random_color(rng):
+    return "".join(rng.choice("89ABCDEF") + rng.choice("0123456789ABCDEF") for _ in range(3))
+
+
+def _pick_forced_shifts(rng, available, count, structure):
+    """Picks up to 'count' available cells that respect one-shift-per-day and the minimum rest."""
+    forced = []
+    for cell in rng.sample(available, len(available)):
+        if len(forced) >= count:
+            break
+        if any(structure.too_close(cell, other) for other in forced):
+            continue
+        forced.append(cell)
+    return sorted(forced)
+
+
+def generate_instance(num_employees, num_days=7, num_shifts=3, availability=0.7,
+                      forced_ratio=0.05, inactive_ratio=0.0, seed=0):
+    """
+    Builds a reproducible team as an instance_io.TeamInstance named after its size and seed.
+
+    availability  - probability that a (day, shift) cell is NOT in unavailable_shifts
+    forced_ratio  - fraction of each employee's available cells turned into forced_shifts
+    inactive_ratio - fraction of employees marked is_active=False
+    Preferences are weekly (see config.PREFS_PERIOD_DAYS); demand is sized so the
+    active workforce can cover ~90% of its target shifts.
+    """
+    rng = random.Random(seed)
+    structure = shift_structure.current_structure(num_days, num_shifts)
+    week = 7
+    target = 5
+    employees = []
+
+    for idx in range(num_employees):
+        cells = [(d, s) for d in range(num_days) for s in range(num_shifts)]
+        unavailable = [cell for cell in cells if rng.random() > availability]
+        available = [cell for cell in cells if cell not in set(unavailable)]
+        forced = _pick_forced_shifts(rng, available, int(len(available) * forced_ratio), structure)
+
+        per_type_cap = max(1, week // 2)
+        prefs = ShiftPreferences(
+            max_shifts=target + rng.randint(0, 1),
+            target_shifts=target - rng.randint(0, 1),
+            max_nights=rng.randint(1, per_type_cap),
+            min_nights=rng.randint(0, 1),
+            max_mornings=rng.randint(1, per_type_cap),
+            min_mornings=rng.randint(0, 1),
+            max_evenings=rng.randint(1, per_type_cap),
+            min_evenings=rng.randint(0, 1)
+        )
+        state = WeeklyState(
+            history_streak=rng.choice([0, 0, 0, 1, 2, 3]),
+            worked_last_fri_night=rng.random() < 0.1,
+            worked_last_sat_noon=rng.random() < 0.1,
+            worked_last_sat_night=rng.random() < 0.1,
+            unavailable_shifts=unavailable,
+            forced_shifts=forced
+        )
+        # Cells too close to last week's final shifts (e.g. Sunday morning after a Saturday night) cannot be forced
+        blocked = structure.carry_over_blocked(state)
+        state.forced_shifts = [cell for cell in forced if cell not in blocked]
+
+        employees.append(Employee(
+            id=100000 + idx,
+            name=f"E{idx:04d}",
+            color=_random_color(rng),
+            contact=ContactDetails(),
+            prefs=prefs,
+            state=state,
+            is_active=rng.random() >= inactive_ratio
+        ))
+
+    active = sum(1 for emp in employees if emp.is_active)
+    demand = max(1, int(active * target * 0.9 / (week * num_shifts)))
+
+    # The seed is part of the name, so the instance can be regenerated from a report
+    return TeamInstance(
+        name=f"e{num_employees}_d{num_days}_s{num_shifts}_seed{seed}",
+        employees=employees,
+        num_days=num_days,
+        num_shifts=num_shifts,
+        shifts_per_day_demand=demand
+    )
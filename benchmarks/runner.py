@@ -0,0 +1,136 @@
+# benchmarks/runner.py
+import argparse
+import contextlib
+import json
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from ortools.sat.python import cp_model
+
+import excel_writer
+import optimizer
+from benchmarks.generator import generate_instance
+from instance_io import instance_settings
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_instance(instance, solve_options, write_excel=True):
+    """Builds, solves and (optionally) renders one instance, returning its measurements."""
+    first_solution = []
+    solve_options.on_solution = lambda event: first_solution or first_solution.append(event.wall_time)
+
+    with open(os.devnull, 'w') as devnull, instance_settings(instance), contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        model, shift_vars = optimizer.build_model(instance.employees)
+        build_seconds = time.perf_counter() - start
+
+        solver, status = optimizer.solve(model, solve_options)
+        found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+        excel_seconds = None
+        if found and write_excel:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                start = time.perf_counter()
+                excel_writer.create_excel_schedule(
+                    solver=solver,
+                    shift_vars=shift_vars,
+                    employees=instance.employees,
+                    num_days=instance.num_days,
+                    num_shifts=instance.num_shifts,
+                    output_path=os.path.join(tmp_dir, "schedule.xlsx")
+                )
+                excel_seconds = time.perf_counter() - start
+
+    proto = model.Proto()
+    return {
+        'instance': instance.name,
+        'employees': len(instance.employees),
+        'days': instance.num_days,
+        'shifts': instance.num_shifts,
+        'demand': instance.shifts_per_day_demand,
+        'variables': len(proto.variables),
+        'constraints': len(proto.constraints),
+        'status': solver.StatusName(status),
+        'build_seconds': build_seconds,
+        'solve_seconds': solver.WallTime(),
+        'first_feasible_seconds': first_solution[0] if first_solution else None,
+        'objective': solver.ObjectiveValue() if found else None,
+        'bound': solver.BestObjectiveBound() if found else None,
+        'excel_seconds': excel_seconds,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def run_suite(sizes, num_days=7, num_shifts=3, availability=0.7, forced_ratio=0.05, seed=0,
+              time_limit=30.0, num_workers=8, write_excel=True):
+    """Runs every size in 'sizes' and returns the JSON-ready report."""
+    results = []
+    for num_employees in sizes:
+        instance = generate_instance(num_employees, num_days=num_days, num_shifts=num_shifts,
+                                     availability=availability, forced_ratio=forced_ratio, seed=seed)
+        options = optimizer.SolveOptions(num_workers=num_workers, max_time_seconds=time_limit,
+                                         random_seed=seed)
+        result = run_instance(instance, options, write_excel=write_excel)
+        results.append(result)
+        print(f"{result['instance']:<28} {result['status']:<10} build {result['build_seconds']:.3f}s  "
+              f"solve {result['solve_seconds']:.3f}s  objective {result['objective']}")
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {
+            'availability': availability, 'forced_ratio': forced_ratio, 'seed': seed,
+            'time_limit': time_limit, 'num_workers': num_workers
+        },
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shift scheduler on synthetic instances.")
+    parser.add_argument('--sizes', default='10,50,100', help="comma-separated employee counts")
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--shifts', type=int, default=3)
+    parser.add_argument('--availability', type=float, default=0.7)
+    parser.add_argument('--forced-ratio', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--time-limit', type=float, default=30.0)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--no-excel', action='store_true', help="skip the Excel rendering step")
+    parser.add_argument('--output', default='bench_results.json')
+    args = parser.parse_args()
+
+    report = run_suite(
+        sizes=[int(size) for size in args.sizes.split(',')],
+        num_days=args.days,
+        num_shifts=args.shifts,
+        availability=args.availability,
+        forced_ratio=args.forced_ratio,
+        seed=args.seed,
+        time_limit=args.time_limit,
+        num_workers=args.workers,
+        write_excel=not args.no_excel
+    )
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Benchmark results written to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
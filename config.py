@@ -1,20 +1,63 @@
 # config.py
-from dataclasses import dataclass, field
-from typing import List, Tuple, Optional
-
 # ==========================================
 #         System Configuration
 # ==========================================
 ENABLE_IMAGE_PARSING = False
 IMAGE_FILENAME = "images/image3.png"
 
+# Employee preferences and weekly state, keyed by employee id (see employee_store.py)
+EMPLOYEES_STORE = "employees.json"
+
+# Previous week's site export used to warm-start the solver (None to disable)
+WARM_START_XLSX = None
+
+# Output formats of the solved schedule: 'xlsx' (styled workbook) and/or 'csv', 'jsonl', 'parquet', 'arrow'
+OUTPUT_FORMATS = ['xlsx']
+
 # ==========================================
 #         Shift Rules & Weights
 # ==========================================
+# Planning horizon in days, starting on a Sunday (e.g. 28 or 56 for a monthly roster)
 NUM_DAYS = 7
-NUM_SHIFTS = 3
+
+# Head count of every (day, shift) when DEMAND is None
 SHIFTS_PER_DAY_DEMAND = 2
 
+# Shifts of every day, in order ('HH:MM'; an end before the start runs past midnight).
+# 'morning' / 'night' tag the shifts counted by the min/max preferences; untagged ones count as evenings.
+SHIFT_TYPES = [
+    {'name': 'בוקר', 'start': '07:00', 'end': '15:00', 'morning': True},
+    {'name': 'צהריים', 'start': '15:00', 'end': '23:00'},
+    {'name': 'לילה', 'start': '23:00', 'end': '07:00', 'night': True},
+]
+NUM_SHIFTS = len(SHIFT_TYPES)
+
+# Workers needed per (day, shift); None puts SHIFTS_PER_DAY_DEMAND on every cell.
+# One row per weekday from Sunday (repeated over longer horizons), one entry per shift type:
+# an int is an exact head count, [min, max] a range where each worker below max costs UNDERSTAFFING.
+DEMAND = [
+    [2, 2, [1, 2]],  # Sunday
+    [2, 2, [1, 2]],  # Monday
+    [2, 2, [1, 2]],  # Tuesday
+    [2, 2, [1, 2]],  # Wednesday
+    [2, 2, [1, 2]],  # Thursday
+    [2, 2, 1],       # Friday
+    [2, [1, 2], 1],  # Saturday
+]
+
+WEEKDAY_NAMES = ["ראשון", "שני", "שלישי", "רביעי", "חמישי", "שישי", "שבת"]
+
+# Rest between two shifts: below MIN_REST_HOURS is forbidden, below PREFERRED_REST_HOURS costs REST_GAP
+MIN_REST_HOURS = 8
+PREFERRED_REST_HOURS = 16
+
+# Longest run of working days (hard) and of nights before CONSECUTIVE_NIGHTS is charged
+MAX_CONSECUTIVE_DAYS = 6
+MAX_CONSECUTIVE_NIGHTS = 2
+
+# Employee preferences (max/target shifts, min/max per shift kind) are weekly and repeat every period
+PREFS_PERIOD_DAYS = 7
+
 # Optimization Weights
 WEIGHTS = {
     'TARGET_SHIFTS': 40,
@@ -25,281 +68,58 @@ WEIGHTS = {
     'CONSECUTIVE_NIGHTS': 20,
     'MIN_NIGHTS': 5,
     'MIN_MORNINGS': 4,
-    'MIN_EVENINGS': 2
+    'MIN_EVENINGS': 2,
+    'UNDERSTAFFING': 60,
+    # Repair mode only (repair.py): every cell that differs from the published roster
+    'ROSTER_CHANGE': 100
 }
 
 
 # ==========================================
-#         Data Models (Nested Structure)
+#         Solver Settings
 # ==========================================
-
-@dataclass
-class ContactDetails:
-    """Static details that do not affect the algorithm."""
-    phone: str = ""
-    email: str = ""
-
-
-@dataclass
-class ShiftPreferences:
-    """Numerical rules and constraints (Configuration)."""
-    max_shifts: int
-    target_shifts: int
-    max_nights: int
-    min_nights: int
-    max_mornings: int
-    min_mornings: int
-    max_evenings: int
-    min_evenings: int
-
-
-@dataclass
-class WeeklyState:
-    """Dynamic State - resets or updates every week."""
-    history_streak: int = 0
-    worked_last_fri_night: bool = False
-    worked_last_sat_noon: bool = False
-    worked_last_sat_night: bool = False
-    # Specific constraints for the current week
-    unavailable_shifts: List[Tuple[int, int]] = field(default_factory=list)
-    forced_shifts: List[Tuple[int, int]] = field(default_factory=list)
-
-
-@dataclass
-class Employee:
-    """Main Object - connects all components."""
-    id: int
-    name: str
-    color: str
-
-    # Composition
-    contact: ContactDetails
-    prefs: ShiftPreferences
-    state: WeeklyState
-
-    is_active: bool = True
-
-
-# ==========================================
-#         Employees List
-# ==========================================
-EMPLOYEES: List[Employee] = [
-    Employee(
-        id=111172, name='Ira', color='FF9999',
-        contact=ContactDetails(),
-        prefs=ShiftPreferences(
-            target_shifts=5, max_shifts=5,
-            max_nights=1, min_nights=1,
-            max_mornings=3, min_mornings=1,
-            max_evenings=3, min_evenings=1
-        ),
-        state=WeeklyState(
-            history_streak=0,
-            worked_last_sat_noon=False,
-            worked_last_sat_night=False,
-            worked_last_fri_night=False,
-            unavailable_shifts=[]
-        )
-    ),
-
-    Employee(
-        id=111386, name='Alex', color='99FF99',
-        contact=ContactDetails(),
-        prefs=ShiftPreferences(
-            target_shifts=5, max_shifts=6,
-            max_nights=2, min_nights=1,
-            max_mornings=1, min_mornings=0,
-            max_evenings=3, min_evenings=1
-        ),
-        state=WeeklyState(
-            history_streak=0,
-            worked_last_sat_noon=False,
-            worked_last_sat_night=False,
-            worked_last_fri_night=False,
-            unavailable_shifts=[(6, 0), (0, 1), (1, 1), (4, 1), (5, 1), (6, 1), (0, 2), (1, 2), (2, 2), (3, 2), (4, 2), (5, 2), (6, 2)]
-        )
-    ),
-
-    Employee(
-        id=106363, name='Barak', color='9999FF',
-        contact=ContactDetails(),
-        prefs=ShiftPreferences(
-            target_shifts=5, max_shifts=5,
-            max_nights=0, min_nights=0,
-            max_mornings=6, min_mornings=4,
-            max_evenings=0, min_evenings=0
-        ),
-        state=WeeklyState(
-            history_streak=0,
-            worked_last_sat_noon=False,
-            worked_last_sat_night=False,
-            worked_last_fri_night=False,
-            forced_shifts=[(0,0),(1,0),(2,0),(3,0),(4,0)],
-            unavailable_shifts=[]
-        )
-    ),
-
-    Employee(
-        id=110606, name='Gilad', color='FFFF99',
-        contact=ContactDetails(),
-        prefs=ShiftPreferences(
-            target_shifts=3, max_shifts=4,
-            max_nights=1, min_nights=1,
-            max_mornings=3, min_mornings=0,
-            max_evenings=4, min_evenings=0
-        ),
-        state=WeeklyState(
-            history_streak=0,
-            worked_last_sat_noon=False,
-            worked_last_sat_night=False,
-            worked_last_fri_night=False,
-            unavailable_shifts=[(1, 0), (2, 0), (0, 1), (1, 1), (2, 1), (0, 2), (1, 2), (2, 2), (3, 2), (5, 2), (6, 2)]
-        )
-    ),
-
-    Employee(
-        id=105744, name='Gadi', color='FFCC99',
-        contact=ContactDetails(),
-        prefs=ShiftPreferences(
-            target_shifts=5, max_shifts=5,
-            max_nights=2, min_nights=2,
-            max_mornings=2, min_mornings=0,
-            max_evenings=3, min_evenings=5
-        ),
-        state=WeeklyState(
-            history_streak=0,
-            worked_last_fri_night=False,
-            worked_last_sat_noon=False,
-            worked_last_sat_night=False,
-            unavailable_shifts=[(1, 0), (3, 0), (5, 0), (1, 1), (3, 1), (0, 2), (2, 2), (3, 2), (4, 2)]
-        )
-    ),
-
-    Employee(
-        id=108119, name='Dolev', color='FF99FF',
-        contact=ContactDetails(),
-        prefs=ShiftPreferences(
-            target_shifts=4, max_shifts=6,
-            max_nights=2, min_nights=2,
-            max_mornings=1, min_mornings=0,
-            max_evenings=4, min_evenings=0
-        ),
-        state=WeeklyState(
-            history_streak=0,
-            worked_last_sat_noon=False,
-            worked_last_sat_night=False,
-            worked_last_fri_night=False,
-            unavailable_shifts=[]
-        ),
-        is_active=False
-    ),
-
-    Employee(
-        id=111145, name='Michael', color='99FFFF',
-        contact=ContactDetails(),
-        prefs=ShiftPreferences(
-            target_shifts=3, max_shifts=5,
-            max_nights=2, min_nights=1,
-            max_mornings=1, min_mornings=0,
-            max_evenings=2, min_evenings=1
-        ),
-        state=WeeklyState(
-            history_streak=0,
-            worked_last_sat_noon=False,
-            worked_last_sat_night=False,
-            worked_last_fri_night=False,
-            unavailable_shifts=[(0, 0), (1, 0), (2, 0), (3, 0), (4, 0), (6, 0), (6, 1), (0, 2), (1, 2), (2, 2), (3, 2), (4, 2), (5, 2), (6, 2)]
-        )
-    ),
-
-    Employee(
-        id=111046, name='Saar', color='CCCCCC',
-        contact=ContactDetails(),
-        prefs=ShiftPreferences(
-            target_shifts=5, max_shifts=5,
-            max_nights=2, min_nights=1,
-            max_mornings=3, min_mornings=0,
-            max_evenings=5, min_evenings=0
-        ),
-        state=WeeklyState(
-            history_streak=0,
-            worked_last_sat_noon=False,
-            worked_last_sat_night=False,
-            worked_last_fri_night=False,
-            unavailable_shifts=[],
-            )
-    ),
-
-    Employee(
-        id=108520, name='Billy', color='87CEFA',
-        contact=ContactDetails(),
-        prefs=ShiftPreferences(
-            target_shifts=5, max_shifts=5,
-            max_nights=2, min_nights=1,
-            max_mornings=3, min_mornings=2,
-            max_evenings=3, min_evenings=2
-        ),
-        state=WeeklyState(
-            history_streak=0,
-            worked_last_sat_noon=False,
-            worked_last_sat_night=False,
-            worked_last_fri_night=False,
-            forced_shifts=[(0, 2), (1, 1), (2, 1), (4, 0), (5, 0)],
-            unavailable_shifts=[(0, 0), (2, 0), (3, 0), (6, 0), (0, 1), (4, 1), (5, 1), (6, 1), (1, 2), (2, 2), (5, 2), (6, 2)]
-        )
-    ),
-
-    Employee(
-        id=109350, name='Shon', color='E6B8B7',
-        contact=ContactDetails(),
-        prefs=ShiftPreferences(
-            target_shifts=5, max_shifts=6,
-            max_nights=3, min_nights=1,
-            max_mornings=1, min_mornings=0,
-            max_evenings=4, min_evenings=0
-        ),
-        state=WeeklyState(
-            worked_last_fri_night=False,
-            history_streak=0,
-            worked_last_sat_noon=False,
-            worked_last_sat_night=False,
-            unavailable_shifts=[]
-        ),
-        is_active=False
-    ),
-
-    Employee(
-        id=10, name='ENF', color='FFFFFF',
-        contact=ContactDetails(),
-        prefs=ShiftPreferences(
-            target_shifts=1, max_shifts=5,
-            max_nights=0, min_nights=5,
-            max_mornings=0, min_mornings=0,
-            max_evenings=5, min_evenings=0
-        ),
-        state=WeeklyState(
-            history_streak=0,
-            worked_last_sat_noon=False,
-            worked_last_sat_night=False,
-            unavailable_shifts=[]
-        ),
-        is_active=True
-    ),
-Employee(
-        id=11, name='ENF-2', color='FFFFFF',
-        contact=ContactDetails(),
-        prefs=ShiftPreferences(
-            target_shifts=1, max_shifts=1,
-            max_nights=0, min_nights=0,
-            max_mornings=0, min_mornings=0,
-            max_evenings=5, min_evenings=0
-        ),
-        state=WeeklyState(
-            history_streak=0,
-            worked_last_sat_noon=False,
-            worked_last_sat_night=False,
-            unavailable_shifts=[]
-        ),
-        is_active=True
-    )
-]
\ No newline at end of file
+SOLVER_NUM_WORKERS = 8
+SOLVER_MAX_TIME_SECONDS = 60.0
+SOLVER_RELATIVE_GAP = 0.0
+SOLVER_RANDOM_SEED = None
+SOLVER_DETERMINISTIC = False
+SOLVER_LOG_PROGRESS = False
+
+# Penalty encoding: 'lean' (one-way implications) or 'reified' (legacy two-way)
+SOFT_CONSTRAINT_ENCODING = 'lean'
+
+# Repair mode: days around a broken assignment that may change, and its time budget
+REPAIR_NEIGHBORHOOD_DAYS = 1
+REPAIR_MAX_TIME_SECONDS = 5.0
+
+# Lexicographic objective: optimize these WEIGHTS groups one after the other (each pinned at its
+# optimum before the next), then the full weighted sum, with a time budget per stage
+LEXICOGRAPHIC_OBJECTIVE = False
+LEXICOGRAPHIC_STAGES = [
+    ['TARGET_SHIFTS'],
+    ['MAX_NIGHTS', 'MIN_NIGHTS', 'CONSECUTIVE_NIGHTS'],
+    ['REST_GAP'],
+]
+LEXICOGRAPHIC_STAGE_SECONDS = 20.0
+
+# Greedy roster (construction.py): warm-start hints when there is no previous roster,
+# and the fallback roster when the time budget runs out before CP-SAT finds a solution
+CONSTRUCTION_HINTS = True
+CONSTRUCTION_FALLBACK = True
+
+# Solution cache (solution_cache.py): solved rosters keyed on a fingerprint of every model input
+SOLUTION_CACHE = True
+SOLUTION_CACHE_DIR = ".solution_cache"
+SOLUTION_CACHE_MAX_ENTRIES = 200
+SOLUTION_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Alternative rosters (main.py --alternatives K): penalty points allowed above the best roster,
+# and the fewest cells in which any two alternatives must differ
+ALTERNATIVES_MAX_GAP = 20
+ALTERNATIVES_MIN_DIFFERENCE = 1
+
+# Order the rosters of interchangeable employees (same prefs and state) to prune symmetric search
+SYMMETRY_BREAKING = True
+
+# On INFEASIBLE, search for a minimal set of conflicting constraint groups
+EXPLAIN_INFEASIBILITY = True
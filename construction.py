@@ -0,0 +1,157 @@
+# construction.py
+import time
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+import config
+import demand as demand_rules
+import feasibility
+import shift_structure
+
+
+@dataclass
+class Construction:
+    """A greedily built roster and the demand it could not cover."""
+    # (employees x days x shifts) uint8 array
+    assignment: np.ndarray
+    # (day, shift, workers missing to reach the minimum)
+    unfilled: List[Tuple[int, int, int]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def complete(self):
+        """True when every cell reaches its minimum demand, so the roster satisfies every hard rule."""
+        return not self.unfilled
+
+
+class _Builder:
+    """Counters of the roster under construction and the vectorized hard-rule check."""
+
+    def __init__(self, employees, structure):
+        num_days, num_shifts = structure.num_days, structure.num_shifts
+        self.structure = structure
+        self.num_days = num_days
+        self.window = config.MAX_CONSECUTIVE_DAYS + 1
+        self.periods = structure.periods()
+        self.kind_of = [t.kind for t in structure.shift_types]
+
+        self.available = feasibility.availability_matrix(employees, num_days, num_shifts)
+        self.x = np.zeros((len(employees), num_days, num_shifts), dtype=np.uint8)
+        self.day_load = np.zeros((len(employees), num_days), dtype=np.int64)
+        self.period_total = np.zeros((len(employees), len(self.periods)), dtype=np.int64)
+        self.kind_count = {kind: np.zeros((len(employees), len(self.periods)), dtype=np.int64)
+                           for kind in ('night', 'morning', 'evening')}
+
+        prefs = [emp.prefs for emp in employees]
+        self.max_shifts = np.array([[structure.scale(p.max_shifts, period) for period in self.periods]
+                                    for p in prefs], dtype=np.int64).reshape(len(employees), len(self.periods))
+        self.target = np.array([[structure.scale(p.target_shifts, period) for period in self.periods]
+                                for p in prefs], dtype=np.int64).reshape(len(employees), len(self.periods))
+        self.kind_max = {kind: np.array([[structure.scale(getattr(p, f'max_{kind}s'), period)
+                                          for period in self.periods] for p in prefs],
+                                        dtype=np.int64).reshape(len(employees), len(self.periods))
+                         for kind in self.kind_count}
+        self.streak = np.array([emp.state.history_streak for emp in employees], dtype=np.int64)
+
+        self.hard_after = {s: [] for s in range(num_shifts)}
+        self.hard_before = {s: [] for s in range(num_shifts)}
+        hard_pairs = structure.hard_rest_pairs()
+        for first, second, offset in hard_pairs:
+            self.hard_after[first].append((second, offset))
+            self.hard_before[second].append((first, offset))
+        self.max_rest_offset = max((offset for _, _, offset in hard_pairs), default=0)
+
+    def assign(self, e, d, s):
+        p = self.structure.period_of(d)
+        self.x[e, d, s] = 1
+        self.day_load[e, d] += 1
+        self.period_total[e, p] += 1
+        self.kind_count[self.kind_of[s]][e, p] += 1
+
+    def affects(self, day, other_day):
+        """Whether an assignment on 'day' can change who may work on 'other_day'."""
+        return (self.structure.period_of(day) == self.structure.period_of(other_day)
+                or abs(day - other_day) <= max(self.window, self.max_rest_offset))
+
+    def eligible(self, d, s):
+        """Boolean vector: who can take (d, s) without breaking a hard rule."""
+        p = self.structure.period_of(d)
+        ok = self.available[:, d, s] & (self.day_load[:, d] == 0) & (self.period_total[:, p] < self.max_shifts[:, p])
+        for second, offset in self.hard_after[s]:
+            if d + offset < self.num_days:
+                ok &= self.x[:, d + offset, second] == 0
+        for first, offset in self.hard_before[s]:
+            if d - offset >= 0:
+                ok &= self.x[:, d - offset, first] == 0
+
+        # Longest run of working days through d, counting last week's streak when it reaches day 0
+        working = self.day_load > 0
+        left = np.zeros(len(ok), dtype=np.int64)
+        alive = np.ones(len(ok), dtype=bool)
+        for k in range(1, min(d, self.window) + 1):
+            alive &= working[:, d - k]
+            left += alive
+        right = np.zeros(len(ok), dtype=np.int64)
+        alive[:] = True
+        for k in range(1, min(self.num_days - 1 - d, self.window) + 1):
+            alive &= working[:, d + k]
+            right += alive
+        run = left + 1 + right
+        run += np.where((left == d) & (self.window - self.streak > 0), self.streak, 0)
+        return ok & (run < self.window)
+
+    def ranking(self, candidates, d, s):
+        """Candidates best first: below their kind's max, then furthest below target, then least loaded."""
+        p = self.structure.period_of(d)
+        kind = self.kind_of[s]
+        over_kind = self.kind_count[kind][candidates, p] >= self.kind_max[kind][candidates, p]
+        above_target = self.period_total[candidates, p] - self.target[candidates, p]
+        load = self.day_load[candidates].sum(axis=1)
+        return candidates[np.lexsort((load, above_target, over_kind))]
+
+
+def construct_roster(employees, num_days=None, num_shifts=None, demand=None) -> Construction:
+    """
+    Builds a roster greedily in milliseconds, without CP-SAT.
+
+    Forced shifts are placed first. Then the cell with the least slack (eligible employees
+    minus missing workers) is filled to its minimum demand, one cell at a time, each time
+    with the eligible employees that best fit their shift-kind and target preferences.
+    A second pass tops range cells up towards their maximum. Every assignment respects
+    unavailability, one shift per day, the minimum rest, max_shifts and the streak limit,
+    so the roster satisfies every hard rule when no cell is left below its minimum.
+    """
+    start = time.perf_counter()
+    structure = shift_structure.current_structure(num_days, num_shifts)
+    demand = demand or demand_rules.demand_matrix(structure.num_days, structure.num_shifts)
+    builder = _Builder(employees, structure)
+
+    for e_idx, emp in enumerate(employees):
+        if emp.is_active:
+            for d, s in sorted(set(emp.state.forced_shifts)):
+                if 0 <= d < structure.num_days and 0 <= s < structure.num_shifts and not builder.x[e_idx, d, s]:
+                    builder.assign(e_idx, d, s)
+
+    cells = [(d, s) for d in range(structure.num_days) for s in range(structure.num_shifts)]
+    for goal in (demand.minimum, demand.maximum):
+        missing = {cell: int(goal[cell]) - int(builder.x[:, cell[0], cell[1]].sum()) for cell in cells}
+        open_cells = {cell for cell, count in missing.items() if count > 0}
+        eligible = {cell: builder.eligible(*cell) for cell in open_cells}
+        while open_cells:
+            # Most constrained first: the fewest spare candidates for the workers still missing
+            cell = min(open_cells, key=lambda c: (int(eligible[c].sum()) - missing[c], c))
+            open_cells.discard(cell)
+            candidates = builder.ranking(np.flatnonzero(eligible[cell]), *cell)
+            for e_idx in candidates[:missing[cell]]:
+                builder.assign(e_idx, *cell)
+
+            # Only cells in reach of the new assignments (same period, streak window, rest pairs) change
+            for other in open_cells:
+                if builder.affects(cell[0], other[0]):
+                    eligible[other] = builder.eligible(*other)
+
+    below = demand.minimum - builder.x.sum(axis=0)
+    unfilled = [(int(d), int(s), int(below[d, s])) for d, s in zip(*np.nonzero(below > 0))]
+    return Construction(builder.x, unfilled, time.perf_counter() - start)
@@ -0,0 +1,75 @@
+# demand.py
+import numpy as np
+
+import config
+
+
+class Demand:
+    """
+    Workers needed per (day, shift) as two (days x shifts) integer arrays.
+    A cell with minimum == maximum needs exactly that many workers; otherwise any head
+    count in [minimum, maximum] is allowed and every worker below maximum costs UNDERSTAFFING.
+    """
+
+    def __init__(self, minimum, maximum):
+        self.minimum = np.asarray(minimum, dtype=np.int64)
+        self.maximum = np.asarray(maximum, dtype=np.int64)
+        if self.minimum.shape != self.maximum.shape:
+            raise ValueError("Demand minimum and maximum must have the same (days x shifts) shape")
+        if (self.minimum < 0).any() or (self.minimum > self.maximum).any():
+            raise ValueError("Demand ranges need 0 <= min <= max in every cell")
+
+    @property
+    def num_days(self):
+        return self.minimum.shape[0]
+
+    @property
+    def num_shifts(self):
+        return self.minimum.shape[1]
+
+    def is_exact(self, day, shift):
+        return self.minimum[day, shift] == self.maximum[day, shift]
+
+    def slots(self, shift):
+        """Most workers any day needs on 'shift' (the number of slot rows in the schedule sheet)."""
+        return int(self.maximum[:, shift].max()) if self.num_days else 0
+
+    def describe(self, day, shift):
+        low, high = int(self.minimum[day, shift]), int(self.maximum[day, shift])
+        return str(low) if low == high else f"{low}-{high}"
+
+
+def _parse_cell(value):
+    if isinstance(value, int):
+        return value, value
+    low, high = value
+    return low, high
+
+
+def demand_matrix(num_days=None, num_shifts=None, spec=None, default=None):
+    """
+    Builds the Demand of the current settings from 'spec' (default config.DEMAND):
+
+    - None: 'default' (config.SHIFTS_PER_DAY_DEMAND) workers on every cell;
+    - a list of rows, one entry per shift, each an int (exact) or a [min, max] range.
+      Row i applies to every day d with d % len(rows) == i, so a 7-row weekly pattern
+      covers a 28-day horizon.
+    """
+    num_days = num_days or config.NUM_DAYS
+    num_shifts = num_shifts or config.NUM_SHIFTS
+    spec = config.DEMAND if spec is None else spec
+    default = config.SHIFTS_PER_DAY_DEMAND if default is None else default
+
+    if spec is None:
+        uniform = np.full((num_days, num_shifts), default, dtype=np.int64)
+        return Demand(uniform, uniform)
+
+    minimum = np.zeros((num_days, num_shifts), dtype=np.int64)
+    maximum = np.zeros((num_days, num_shifts), dtype=np.int64)
+    for day in range(num_days):
+        row = spec[day % len(spec)]
+        if len(row) != num_shifts:
+            raise ValueError(f"Demand row {day % len(spec)} has {len(row)} entries but there are {num_shifts} shifts")
+        for shift, value in enumerate(row):
+            minimum[day, shift], maximum[day, shift] = _parse_cell(value)
+    return Demand(minimum, maximum)
@@ -0,0 +1,105 @@
+# employee_store.py
+import contextlib
+import json
+import os
+import re
+import shutil
+import tempfile
+
+import config
+from instance_io import employee_from_dict, employee_to_dict
+
+# Weekly state after the global reset done before importing new constraints
+RESET_STATE = {
+    'history_streak': 0,
+    'worked_last_fri_night': False,
+    'worked_last_sat_noon': False,
+    'worked_last_sat_night': False,
+    'unavailable_shifts': []
+}
+
+
+class EmployeeStore:
+    """
+    Employee preferences and weekly state kept in a JSON file keyed by employee id:
+    {"employees": {"<id>": {"name": ..., "prefs": {...}, "state": {...}, ...}}}
+
+    All writes go through transaction(), which applies a batch of changes in memory
+    and replaces the file atomically, so readers never see a half-updated roster.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or config.EMPLOYEES_STORE
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)['employees']
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, records):
+        text = json.dumps({'employees': records}, indent=2, ensure_ascii=False)
+        # Keep (day, shift) cells on one line: [0, 1] instead of four lines
+        text = re.sub(r"\[\s+(-?\d+),\s+(-?\d+)\s+\]", r"[\1, \2]", text)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text + "\n")
+            # mkstemp creates the file owner-only; keep the store's mode (or the umask default)
+            if os.path.exists(self.path):
+                shutil.copymode(self.path, tmp_path)
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(tmp_path, 0o666 & ~umask)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Yields the {id (str): record} dict; changes are written in one atomic replace on success."""
+        records = self._read()
+        yield records
+        self._write(records)
+
+    def load_employees(self):
+        """Builds the Employee dataclasses, in the order they are stored."""
+        return [employee_from_dict({'id': int(emp_id), **record}) for emp_id, record in self._read().items()]
+
+    def upsert_employees(self, employees):
+        """Inserts or replaces whole employees in one transaction."""
+        with self.transaction() as records:
+            for emp in employees:
+                record = employee_to_dict(emp)
+                emp_id = str(record.pop('id'))
+                records[emp_id] = record
+
+    def update_states(self, state_updates, reset=None):
+        """
+        Bulk update of WeeklyState fields: {employee_id: {field: value}}.
+        'reset' (a {field: value} dict) is first applied to every employee.
+        Returns the ids that were not found in the store.
+        """
+        missing = []
+        with self.transaction() as records:
+            if reset:
+                for record in records.values():
+                    record['state'].update(reset)
+
+            for emp_id, fields in state_updates.items():
+                record = records.get(str(emp_id))
+                if record is None:
+                    missing.append(emp_id)
+                    continue
+                record['state'].update(fields)
+        return missing
+
+
+def load_employees(path=None):
+    """Shortcut for EmployeeStore(path).load_employees()."""
+    return EmployeeStore(path).load_employees()
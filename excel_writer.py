@@ -1,91 +1,152 @@
-# excel_writer.py
+import numpy as np
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
 
-
-def create_excel_schedule(solver, shift_vars, employees, num_days, num_shifts, shifts_per_day_demand,
-                          unused_colors=None):
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Schedule"
+import demand as demand_rules
+import shift_structure
+from optimizer import solution_array
+
+DEFAULT_OUTPUT_PATH = "shift_schedule_output/shift_schedule_colored.xlsx"
+DEFAULT_ALTERNATIVES_PATH = "shift_schedule_output/shift_schedule_alternatives.xlsx"
+
+
+class StyleCache:
+    """Shared style objects for the write-only sheet; one PatternFill per distinct color."""
+
+    def __init__(self):
+        self.header_font = Font(bold=True, color="FFFFFF")
+        self.header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+        self.bold_font = Font(bold=True)
+        self.title_font = Font(bold=True, size=14)
+        self.center_align = Alignment(horizontal='center', vertical='center')
+        self.thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'),
+                                  bottom=Side(style='thin'))
+        self._fills = {}
+
+    def fill(self, color):
+        if color not in self._fills:
+            self._fills[color] = PatternFill(start_color=color, end_color=color, fill_type="solid")
+        return self._fills[color]
+
+
+def kind_counts(assignment, structure):
+    """{'night' / 'morning' / 'evening': shifts of that kind per employee} from the (employees x days x shifts) array."""
+    per_shift = assignment.sum(axis=1, dtype=np.int64)
+    return {kind: per_shift[:, structure.shifts_of_kind(kind)].sum(axis=1)
+            for kind in ('night', 'morning', 'evening')}
+
+
+def _cell(ws, value=None, font=None, fill=None, alignment=None, border=None):
+    cell = WriteOnlyCell(ws, value=value)
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    if alignment is not None:
+        cell.alignment = alignment
+    if border is not None:
+        cell.border = border
+    return cell
+
+
+def _write_schedule_sheet(wb, title, assignment, employees, structure, demand, styles):
+    """Appends one roster sheet (slot rows per shift, then the per-employee summary) to 'wb'."""
+    num_days = structure.num_days
+    active = np.array([emp.is_active for emp in employees], dtype=bool)
+    assignment = assignment.copy()
+    assignment[~active] = 0
+
+    ws = wb.create_sheet(title)
     ws.sheet_view.rightToLeft = True
 
-    days_names = ["ראשון", "שני", "שלישי", "רביעי", "חמישי", "שישי", "שבת"]
-    shifts_names = ["בוקר", "צהריים", "לילה"]
-
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    center_align = Alignment(horizontal='center', vertical='center')
-    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'),
-                         bottom=Side(style='thin'))
+    days_names = structure.day_names()
+    shifts_names = structure.shift_names()
 
     # Header
-    ws.cell(row=1, column=1).value = "משמרת"
-    for i, day in enumerate(days_names):
-        cell = ws.cell(row=1, column=i + 2)
-        cell.value = day
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = center_align
-
-    current_row = 2
+    ws.append([_cell(ws, "משמרת")] + [
+        _cell(ws, day, font=styles.header_font, fill=styles.header_fill, alignment=styles.center_align)
+        for day in days_names
+    ])
+
+    # Workers of every (day, shift) cell, in employee order
+    workers = [[np.flatnonzero(assignment[:, d, s_idx]) for d in range(num_days)]
+               for s_idx in range(len(shifts_names))]
+
     for s_idx, s_name in enumerate(shifts_names):
-        for slot in range(shifts_per_day_demand):
-            shift_cell = ws.cell(row=current_row, column=1)
-            shift_cell.value = f"{s_name} ({slot + 1})"
-            shift_cell.font = Font(bold=True)
-            shift_cell.alignment = center_align
-            shift_cell.border = thin_border
+        for slot in range(demand.slots(s_idx)):
+            row = [_cell(ws, f"{s_name} ({slot + 1})", font=styles.bold_font, alignment=styles.center_align,
+                         border=styles.thin_border)]
 
             for d in range(num_days):
-                assigned_workers = []
-                for e_idx, emp in enumerate(employees):
-                    if not emp.is_active: continue
-                    if solver.Value(shift_vars[(e_idx, d, s_idx)]):
-                        assigned_workers.append(emp)
-
-                cell = ws.cell(row=current_row, column=d + 2)
-                cell.border = thin_border
-                cell.alignment = center_align
-
-                if len(assigned_workers) > slot:
-                    worker = assigned_workers[slot]
-                    cell.value = worker.name
+                assigned = workers[s_idx][d]
+                if len(assigned) > slot:
+                    worker = employees[assigned[slot]]
                     # Color is directly on Employee, so this works fine
-                    cell.fill = PatternFill(start_color=worker.color, end_color=worker.color, fill_type="solid")
-            current_row += 1
-        current_row += 1
-
-    # Summary
-    summary_row = current_row + 2
-    ws.cell(row=summary_row, column=1).value = "סיכום עובדים"
-    ws.cell(row=summary_row, column=1).font = Font(bold=True, size=14)
+                    row.append(_cell(ws, worker.name, fill=styles.fill(worker.color),
+                                     alignment=styles.center_align, border=styles.thin_border))
+                else:
+                    row.append(_cell(ws, alignment=styles.center_align, border=styles.thin_border))
+            ws.append(row)
+        ws.append([])
+
+    # Summary (two empty rows, then title, headers and one row per active employee)
+    ws.append([])
+    ws.append([])
+    ws.append([_cell(ws, "סיכום עובדים", font=styles.title_font)])
 
     headers = ["שם", "סהכ", "לילות", "בקרים", "ערבים"]
-    for col_idx, h in enumerate(headers):
-        ws.cell(row=summary_row + 1, column=col_idx + 1).value = h
-        ws.cell(row=summary_row + 1, column=col_idx + 1).font = Font(bold=True)
+    ws.append([_cell(ws, h, font=styles.bold_font) for h in headers])
 
-    row_offset = 2
-    for e_idx, emp in enumerate(employees):
-        if not emp.is_active: continue
-
-        r = summary_row + row_offset
-        row_offset += 1
-
-        name_cell = ws.cell(row=r, column=1)
-        name_cell.value = emp.name
-        name_cell.fill = PatternFill(start_color=emp.color, end_color=emp.color, fill_type="solid")
-
-        nights = sum(solver.Value(shift_vars[(e_idx, d, 2)]) for d in range(num_days))
-        mornings = sum(solver.Value(shift_vars[(e_idx, d, 0)]) for d in range(num_days))
-        evenings = sum(solver.Value(shift_vars[(e_idx, d, 1)]) for d in range(num_days))
+    # Shifts per kind for every employee
+    counts = kind_counts(assignment, structure)
+    for e_idx in np.flatnonzero(active):
+        emp = employees[e_idx]
+        nights, mornings, evenings = (int(counts[kind][e_idx]) for kind in ('night', 'morning', 'evening'))
         total = nights + mornings + evenings
-
-        ws.cell(row=r, column=2).value = total
-        ws.cell(row=r, column=3).value = nights
-        ws.cell(row=r, column=4).value = mornings
-        ws.cell(row=r, column=5).value = evenings
-
-    wb.save("shift_schedule_output/shift_schedule_colored.xlsx")
-    print("Excel file created successfully.")
\ No newline at end of file
+        ws.append([_cell(ws, emp.name, fill=styles.fill(emp.color)), total, nights, mornings, evenings])
+
+
+def create_excel_schedule(solver, shift_vars, employees, num_days, num_shifts, demand=None,
+                          unused_colors=None, output_path=DEFAULT_OUTPUT_PATH):
+    """
+    Writes the roster as a right-to-left sheet: one row per worker slot of every shift
+    (as many as the largest head count of that shift in 'demand', default the configured
+    matrix), one column per day, followed by a per-employee summary.
+    """
+    demand = demand or demand_rules.demand_matrix(num_days, num_shifts)
+    # Read the whole solution once: (employees x days x shifts)
+    assignment = solution_array(solver, shift_vars, len(employees), num_days, num_shifts)
+
+    wb = openpyxl.Workbook(write_only=True)
+    structure = shift_structure.current_structure(num_days, num_shifts)
+    _write_schedule_sheet(wb, "Schedule", assignment, employees, structure, demand, StyleCache())
+
+    wb.save(output_path)
+    print("Excel file created successfully.")
+
+
+def create_alternatives_workbook(alternatives, employees, num_days, num_shifts, demand=None,
+                                 output_path=DEFAULT_ALTERNATIVES_PATH):
+    """
+    Writes several rosters (alternatives.Alternative entries) into one workbook: a
+    comparison sheet with every roster's penalty per WEIGHTS key, then one schedule
+    sheet per roster in the same layout as create_excel_schedule.
+    """
+    demand = demand or demand_rules.demand_matrix(num_days, num_shifts)
+    structure = shift_structure.current_structure(num_days, num_shifts)
+    styles = StyleCache()
+    wb = openpyxl.Workbook(write_only=True)
+
+    keys = sorted({key for alt in alternatives for key in alt.breakdown})
+    ws = wb.create_sheet("Comparison")
+    ws.append([_cell(ws, h, font=styles.header_font, fill=styles.header_fill, alignment=styles.center_align)
+               for h in ["Roster", "Penalty", "Changed cells"] + keys])
+    for alt in alternatives:
+        ws.append([alt.title, alt.objective, alt.difference] + [alt.breakdown.get(key, 0) for key in keys])
+
+    for alt in alternatives:
+        _write_schedule_sheet(wb, alt.title, alt.assignment, employees, structure, demand, styles)
+
+    wb.save(output_path)
+    print(f"Excel file with {len(alternatives)} alternative rosters created successfully.")
@@ -0,0 +1,148 @@
+# export_writer.py
+import contextlib
+import csv
+import json
+import os
+
+import numpy as np
+
+import excel_writer
+import shift_structure
+from optimizer import solution_array
+
+DEFAULT_OUTPUT_PREFIX = "shift_schedule_output/shift_schedule"
+
+# Plain table formats for automated pipelines; 'parquet' and 'arrow' need pyarrow
+FORMATS = ('csv', 'jsonl', 'parquet', 'arrow')
+EXTENSIONS = {'csv': '.csv', 'jsonl': '.jsonl', 'parquet': '.parquet', 'arrow': '.arrow'}
+
+
+def roster_table(assignment, employees):
+    """
+    One row per assigned (employee, day, shift), as columns:
+    {'employee_id', 'name', 'day', 'shift'}. Rows are ordered by employee, day, shift.
+    """
+    e_idx, days, shifts = np.nonzero(assignment)
+    return {
+        'employee_id': [employees[e].id for e in e_idx],
+        'name': [employees[e].name for e in e_idx],
+        'day': days.tolist(),
+        'shift': shifts.tolist()
+    }
+
+
+def summary_table(assignment, employees, structure):
+    """Per active employee: total shifts and nights / mornings / evenings, as columns."""
+    counts = excel_writer.kind_counts(assignment, structure)
+    active = [e_idx for e_idx, emp in enumerate(employees) if emp.is_active]
+    return {
+        'employee_id': [employees[e].id for e in active],
+        'name': [employees[e].name for e in active],
+        'total': assignment[active].sum(axis=(1, 2), dtype=np.int64).tolist(),
+        'nights': counts['night'][active].tolist(),
+        'mornings': counts['morning'][active].tolist(),
+        'evenings': counts['evening'][active].tolist()
+    }
+
+
+def _rows(columns):
+    names = list(columns)
+    return names, zip(*(columns[name] for name in names))
+
+
+def _write_csv(columns, path):
+    names, rows = _rows(columns)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        writer.writerows(rows)
+
+
+def _write_jsonl(columns, path):
+    names, rows = _rows(columns)
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n")
+
+
+def _write_columnar(columns, path, fmt):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError(f"The '{fmt}' export format needs pyarrow (pip install pyarrow).") from None
+
+    table = pa.table(columns)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, path)
+
+
+def write_table(columns, path, fmt):
+    """Writes a {column: values} table to 'path' in one of FORMATS."""
+    if fmt == 'csv':
+        _write_csv(columns, path)
+    elif fmt == 'jsonl':
+        _write_jsonl(columns, path)
+    elif fmt in ('parquet', 'arrow'):
+        _write_columnar(columns, path, fmt)
+    else:
+        raise ValueError(f"Unknown export format '{fmt}' (expected one of {', '.join(FORMATS)})")
+
+
+def export_schedule(solver, shift_vars, employees, num_days, num_shifts, fmt='csv',
+                    output_prefix=DEFAULT_OUTPUT_PREFIX):
+    """
+    Writes the solved roster and the per-employee summary as two plain tables,
+    '{output_prefix}_roster{ext}' and '{output_prefix}_summary{ext}'; no workbook
+    is built. Returns the written paths.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}' (expected one of {', '.join(FORMATS)})")
+
+    structure = shift_structure.current_structure(num_days, num_shifts)
+    assignment = solution_array(solver, shift_vars, len(employees), num_days, num_shifts)
+    assignment[~np.array([emp.is_active for emp in employees], dtype=bool)] = 0
+
+    directory = os.path.dirname(output_prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    paths = []
+    for table_name, columns in (('roster', roster_table(assignment, employees)),
+                                ('summary', summary_table(assignment, employees, structure))):
+        path = f"{output_prefix}_{table_name}{EXTENSIONS[fmt]}"
+        write_table(columns, path, fmt)
+        paths.append(path)
+
+    print(f"Exported {fmt} files: {', '.join(paths)}")
+    return paths
+
+
+def write_outputs(formats, solver, shift_vars, employees, num_days, num_shifts, xlsx_path, output_prefix,
+                  report=None):
+    """
+    Writes the solved schedule in every requested format ('xlsx' and/or FORMATS).
+    The styled workbook is only rendered when 'xlsx' is asked for.
+    Each format is timed as its own report phase ('excel', 'export_csv', ...). Returns the written paths.
+    """
+    paths = []
+    for fmt in formats:
+        phase = 'excel' if fmt == 'xlsx' else f'export_{fmt}'
+        with report.phase(phase) if report else contextlib.nullcontext():
+            if fmt == 'xlsx':
+                excel_writer.create_excel_schedule(
+                    solver=solver,
+                    shift_vars=shift_vars,
+                    employees=employees,
+                    num_days=num_days,
+                    num_shifts=num_shifts,
+                    output_path=xlsx_path
+                )
+                paths.append(xlsx_path)
+            else:
+                paths.extend(export_schedule(solver, shift_vars, employees, num_days, num_shifts,
+                                             fmt=fmt, output_prefix=output_prefix))
+    return paths
@@ -0,0 +1,186 @@
+# feasibility.py
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+import config
+import demand as demand_rules
+import shift_structure
+
+
+@dataclass
+class Finding:
+    """One reason why the instance cannot be solved, pointing at the employee and/or cell involved."""
+    rule: str
+    message: str
+    employee: Optional[str] = None
+    day: Optional[int] = None
+    shift: Optional[int] = None
+
+    def __str__(self):
+        return f"[{self.rule}] {self.message}"
+
+
+def blocked_cells(emp, structure):
+    """Cells the employee can never work: unavailability plus too little rest after last week's final shifts."""
+    return set(emp.state.unavailable_shifts) | structure.carry_over_blocked(emp.state)
+
+
+def availability_matrix(employees, num_days, num_shifts):
+    """Boolean (employees x days x shifts) array, True where the employee may be assigned."""
+    structure = shift_structure.current_structure(num_days, num_shifts)
+    available = np.zeros((len(employees), num_days, num_shifts), dtype=bool)
+    for e_idx, emp in enumerate(employees):
+        if not emp.is_active:
+            continue
+        available[e_idx] = True
+        for day, shift in blocked_cells(emp, structure):
+            if 0 <= day < num_days and 0 <= shift < num_shifts:
+                available[e_idx, day, shift] = False
+    return available
+
+
+def _check_forced_shifts(emp, structure):
+    num_days, num_shifts = structure.num_days, structure.num_shifts
+    findings = []
+    forced = sorted(set(emp.state.forced_shifts))
+    blocked = blocked_cells(emp, structure)
+
+    for day, shift in forced:
+        if not (0 <= day < num_days and 0 <= shift < num_shifts):
+            findings.append(Finding('forced_out_of_range',
+                                    f"{emp.name} is forced to (Day {day}, Shift {shift}), outside the horizon.",
+                                    emp.name, day, shift))
+        elif (day, shift) in emp.state.unavailable_shifts:
+            findings.append(Finding('forced_unavailable',
+                                    f"{emp.name} is forced to (Day {day}, Shift {shift}) but is marked unavailable.",
+                                    emp.name, day, shift))
+        elif (day, shift) in blocked:
+            findings.append(Finding('carry_over_rest',
+                                    f"{emp.name} cannot be forced to (Day {day}, Shift {shift}): too little rest "
+                                    f"after last week's final shifts.",
+                                    emp.name, day, shift))
+
+    for period in structure.periods():
+        in_period = [cell for cell in forced if cell[0] in period]
+        max_shifts = structure.scale(emp.prefs.max_shifts, period)
+        if len(in_period) > max_shifts:
+            findings.append(Finding('forced_over_max_shifts',
+                                    f"{emp.name} has {len(in_period)} forced shifts on Days {period.start}-"
+                                    f"{period.stop - 1} but max_shifts is {max_shifts}.",
+                                    emp.name))
+
+    for i, (day, shift) in enumerate(forced):
+        for next_day, next_shift in forced[i + 1:]:
+            if next_day == day:
+                findings.append(Finding('forced_same_day',
+                                        f"{emp.name} is forced to two shifts on Day {day} "
+                                        f"(Shifts {shift} and {next_shift}).",
+                                        emp.name, day, next_shift))
+            elif structure.too_close((day, shift), (next_day, next_shift)):
+                findings.append(Finding('forced_back_to_back',
+                                        f"{emp.name} is forced back-to-back: (Day {day}, Shift {shift}) "
+                                        f"then (Day {next_day}, Shift {next_shift}).",
+                                        emp.name, next_day, next_shift))
+    return findings
+
+
+def _check_streak(emp, num_days):
+    """Mirrors rule F of the optimizer against the days that forced shifts already occupy."""
+    forced_days = {day for day, _ in emp.state.forced_shifts if 0 <= day < num_days}
+    streak = emp.state.history_streak
+    window = config.MAX_CONSECUTIVE_DAYS + 1
+
+    if streak > 0:
+        limit = window - streak
+        if 0 < limit <= num_days and all(day in forced_days for day in range(limit)):
+            return [Finding('streak_limit',
+                            f"{emp.name} has a history streak of {streak} and is forced to work every one of "
+                            f"Days 0-{limit - 1}, exceeding the maximum streak.",
+                            emp.name, limit - 1)]
+
+    run = 0
+    for day in range(num_days):
+        run = run + 1 if day in forced_days else 0
+        if run >= window:
+            return [Finding('streak_limit',
+                            f"{emp.name} is forced to work Days {day - run + 1}-{day}, but at most "
+                            f"{config.MAX_CONSECUTIVE_DAYS} consecutive days are allowed.",
+                            emp.name, day)]
+    return []
+
+
+def check_feasibility(employees, num_days=None, num_shifts=None, demand=None) -> List[Finding]:
+    """
+    Cheap pre-check of the hard rules of optimizer.build_model, run before paying for a solve.
+    Returns a list of findings; an empty list means no obvious infeasibility was found
+    (CP-SAT may still prove the instance infeasible).
+    'demand' is a demand.Demand (default: the configured matrix); the minimum of every
+    cell must be reachable and its maximum not exceeded by forced shifts.
+    """
+    num_days = num_days or config.NUM_DAYS
+    num_shifts = num_shifts or config.NUM_SHIFTS
+    demand = demand or demand_rules.demand_matrix(num_days, num_shifts)
+    minimum, maximum = demand.minimum, demand.maximum
+    structure = shift_structure.current_structure(num_days, num_shifts)
+
+    findings = []
+
+    # --- Per-employee rules ---
+    for emp in employees:
+        if not emp.is_active:
+            if emp.state.forced_shifts:
+                findings.append(Finding('forced_inactive',
+                                        f"{emp.name} is inactive but has forced shifts.", emp.name))
+            continue
+        findings.extend(_check_forced_shifts(emp, structure))
+        findings.extend(_check_streak(emp, num_days))
+
+    # --- Capacity per (day, shift) cell ---
+    available = availability_matrix(employees, num_days, num_shifts)
+    capacity = available.sum(axis=0)
+    for day, shift in zip(*np.nonzero(capacity < minimum)):
+        findings.append(Finding('cell_capacity',
+                                f"Day {day}, Shift {shift}: only {capacity[day, shift]} available employees "
+                                f"for a demand of {demand.describe(day, shift)}.",
+                                day=int(day), shift=int(shift)))
+
+    forced_count = np.zeros((num_days, num_shifts), dtype=int)
+    for emp in employees:
+        if emp.is_active:
+            for day, shift in set(emp.state.forced_shifts):
+                if 0 <= day < num_days and 0 <= shift < num_shifts:
+                    forced_count[day, shift] += 1
+    for day, shift in zip(*np.nonzero(forced_count > maximum)):
+        findings.append(Finding('cell_over_forced',
+                                f"Day {day}, Shift {shift}: {forced_count[day, shift]} employees are forced "
+                                f"for a demand of {demand.describe(day, shift)}.",
+                                day=int(day), shift=int(shift)))
+
+    # --- Capacity per day (one shift per day each) and over the whole horizon ---
+    workers_per_day = available.any(axis=2).sum(axis=0)
+    required_per_day = minimum.sum(axis=1)
+    for day in np.nonzero(workers_per_day < required_per_day)[0]:
+        findings.append(Finding('day_capacity',
+                                f"Day {day}: {workers_per_day[day]} employees can work but "
+                                f"{required_per_day[day]} shifts must be covered.",
+                                day=int(day)))
+
+    # Per period: at most max_shifts, and at most one shift on each day the employee can work
+    working_days = available.any(axis=2)
+    supply = sum(min(structure.scale(emp.prefs.max_shifts, period), int(working_days[e_idx, period].sum()))
+                 for e_idx, emp in enumerate(employees) if emp.is_active
+                 for period in structure.periods())
+    required = int(minimum.sum())
+    if supply < required:
+        findings.append(Finding('horizon_capacity',
+                                f"The workforce can cover at most {supply} shifts but {required} are required."))
+
+    return findings
+
+
+def print_findings(findings):
+    print(f"❌ Pre-check found {len(findings)} problem(s) before solving:")
+    for finding in findings:
+        print(f"   - {finding}")
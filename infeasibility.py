@@ -0,0 +1,117 @@
+# infeasibility.py
+from ortools.sat.python import cp_model
+
+import config
+import employee_store
+import optimizer
+import shift_structure
+from run_report import RunReport
+
+
+def build_explain_model(employees, encoding=None):
+    """
+    Builds only the hard rules of the weekly model, with every constraint group
+    guarded by an assumption literal. Returns (model, {group name: literal}).
+
+    Groups: 'unavailable:{name}', 'carry_over:{name}', 'forced:{name}',
+    'max_shifts:{name}', 'streak:{name}' and 'demand:d{day}_s{shift}'.
+    Soft constraints are left out: their slack variables can always absorb a violation.
+    """
+    encoding = encoding or config.SOFT_CONSTRAINT_ENCODING
+    num_days = config.NUM_DAYS
+    num_shifts = config.NUM_SHIFTS
+
+    structure = shift_structure.current_structure(num_days, num_shifts)
+    model = cp_model.CpModel()
+    assumptions = {}
+
+    def guard(group):
+        literal = model.NewBoolVar(f'assume[{group}]')
+        assumptions[group] = literal
+        return literal
+
+    # Unavailable and forced cells stay decision variables so they can be guarded
+    fixed = optimizer.build_availability(employees, num_days, num_shifts, fold_requests=False)
+    shift_vars = optimizer.create_shift_vars(model, employees, fixed, num_days, num_shifts)
+
+    for e_idx, emp in enumerate(employees):
+        if not emp.is_active:
+            continue
+
+        requests = [
+            ('unavailable', emp.state.unavailable_shifts, 0),
+            ('carry_over', sorted(structure.carry_over_blocked(emp.state)), 0),
+            ('forced', emp.state.forced_shifts, 1),
+        ]
+        for group, cells, value in requests:
+            cells = [(d, s) for d, s in cells if 0 <= d < num_days and 0 <= s < num_shifts]
+            if not cells:
+                continue
+            literal = guard(f'{group}:{emp.name}')
+            for day, shift in cells:
+                model.Add(shift_vars[(e_idx, day, shift)] == value).OnlyEnforceIf(literal)
+
+    optimizer.add_hard_constraints(model, employees, shift_vars, num_days, num_shifts, encoding,
+                                   RunReport(), guard=guard)
+    return model, assumptions
+
+
+def _is_infeasible(model, literals, max_time_seconds):
+    """Solves with only 'literals' assumed; returns (infeasible?, solver)."""
+    model.ClearAssumptions()
+    model.AddAssumptions(literals)
+
+    solver = cp_model.CpSolver()
+    # Assumption cores are only reported by the single-threaded search
+    solver.parameters.num_workers = 1
+    solver.parameters.max_time_in_seconds = max_time_seconds
+    status = solver.Solve(model)
+    return status == cp_model.INFEASIBLE, solver
+
+
+def explain_infeasibility(employees, shrink=True, max_time_seconds=10.0, encoding=None):
+    """
+    Returns a small set of constraint-group names that cannot hold together,
+    or an empty list if the hard rules are satisfiable.
+
+    CP-SAT's SufficientAssumptionsForInfeasibility gives a first conflicting set;
+    with 'shrink' each group is then dropped in turn and kept out whenever the
+    rest is still infeasible, which leaves a minimal set.
+    """
+    model, assumptions = build_explain_model(employees, encoding=encoding)
+    names = list(assumptions)
+    index_to_name = {assumptions[name].Index(): name for name in names}
+
+    infeasible, solver = _is_infeasible(model, [assumptions[n] for n in names], max_time_seconds)
+    if not infeasible:
+        return []
+
+    core = [index_to_name[i] for i in solver.SufficientAssumptionsForInfeasibility() if i in index_to_name]
+    if not core:
+        # Infeasible even without any assumption: the unguarded background rules clash
+        return []
+    print(f"🔎 Initial conflict: {len(core)} of {len(names)} constraint groups.")
+
+    if shrink:
+        for name in list(core):
+            candidate = [n for n in core if n != name]
+            still_infeasible, _ = _is_infeasible(model, [assumptions[n] for n in candidate], max_time_seconds)
+            if still_infeasible:
+                core = candidate
+        print(f"🔎 Shrunk to {len(core)} constraint groups.")
+
+    return core
+
+
+def print_conflict(core):
+    print("❌ These constraint groups cannot all hold together:")
+    for name in core:
+        print(f"   - {name}")
+
+
+if __name__ == "__main__":
+    conflict = explain_infeasibility(employee_store.load_employees())
+    if conflict:
+        print_conflict(conflict)
+    else:
+        print("✅ The hard constraints are satisfiable.")
@@ -0,0 +1,104 @@
+# instance_io.py
+import contextlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+import config
+from models import ContactDetails, Employee, ShiftPreferences, WeeklyState
+
+
+@dataclass
+class TeamInstance:
+    """One team's scheduling input: its employees plus the shift rules (defaults come from config.py)."""
+    name: str
+    employees: List[Employee]
+    num_days: int = field(default_factory=lambda: config.NUM_DAYS)
+    num_shifts: int = field(default_factory=lambda: config.NUM_SHIFTS)
+    shifts_per_day_demand: int = field(default_factory=lambda: config.SHIFTS_PER_DAY_DEMAND)
+    # Shift-type dicts as in config.SHIFT_TYPES; None keeps the configured ones
+    shift_types: Optional[List[dict]] = None
+    # Demand rows as in config.DEMAND; None puts shifts_per_day_demand on every cell
+    demand: Optional[list] = None
+
+
+def employee_to_dict(emp: Employee) -> dict:
+    return asdict(emp)
+
+
+def employee_from_dict(data: dict) -> Employee:
+    """Rebuilds the nested Employee dataclasses; JSON lists of cells become (day, shift) tuples."""
+    state = dict(data.get('state', {}))
+    for key in ('unavailable_shifts', 'forced_shifts'):
+        state[key] = [tuple(cell) for cell in state.get(key, [])]
+
+    return Employee(
+        id=data['id'],
+        name=data['name'],
+        color=data.get('color', 'FFFFFF'),
+        contact=ContactDetails(**data.get('contact', {})),
+        prefs=ShiftPreferences(**data['prefs']),
+        state=WeeklyState(**state),
+        is_active=data.get('is_active', True)
+    )
+
+
+def load_instance(path) -> TeamInstance:
+    """
+    Reads a team file:
+    {"name": ..., "num_days": 7, "num_shifts": 3, "shifts_per_day_demand": 2,
+     "shift_types": [{"name": ..., "start": "07:00", "end": "15:00", "morning": true}, ...],
+     "demand": [[2, 2, [1, 2]], ...],
+     "employees": [...]}
+    Everything but "employees" is optional; "num_shifts" defaults to the number of shift types.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    defaults = TeamInstance(name='', employees=[])
+    shift_types = data.get('shift_types')
+    return TeamInstance(
+        name=data.get('name') or os.path.splitext(os.path.basename(path))[0],
+        employees=[employee_from_dict(emp) for emp in data['employees']],
+        num_days=data.get('num_days', defaults.num_days),
+        num_shifts=data.get('num_shifts', len(shift_types) if shift_types else defaults.num_shifts),
+        shifts_per_day_demand=data.get('shifts_per_day_demand', defaults.shifts_per_day_demand),
+        shift_types=shift_types,
+        demand=data.get('demand')
+    )
+
+
+def save_instance(instance: TeamInstance, path):
+    data = {
+        'name': instance.name,
+        'num_days': instance.num_days,
+        'num_shifts': instance.num_shifts,
+        'shifts_per_day_demand': instance.shifts_per_day_demand,
+        **({'shift_types': instance.shift_types} if instance.shift_types else {}),
+        **({'demand': instance.demand} if instance.demand else {}),
+        'employees': [employee_to_dict(emp) for emp in instance.employees]
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+@contextlib.contextmanager
+def instance_settings(instance):
+    """
+    Temporarily points the global shift rules in config.py at the instance's dimensions,
+    shift types and demand. The configured DEMAND rows are team-specific, so an instance
+    without its own demand uses shifts_per_day_demand everywhere.
+    """
+    saved = (config.NUM_DAYS, config.NUM_SHIFTS, config.SHIFTS_PER_DAY_DEMAND, config.SHIFT_TYPES, config.DEMAND)
+    config.NUM_DAYS = instance.num_days
+    config.NUM_SHIFTS = instance.num_shifts
+    config.SHIFTS_PER_DAY_DEMAND = instance.shifts_per_day_demand
+    config.DEMAND = instance.demand
+    if instance.shift_types:
+        config.SHIFT_TYPES = instance.shift_types
+    try:
+        yield
+    finally:
+        (config.NUM_DAYS, config.NUM_SHIFTS, config.SHIFTS_PER_DAY_DEMAND, config.SHIFT_TYPES,
+         config.DEMAND) = saved
@@ -1,15 +1,66 @@
 # main.py
+import argparse
 import os
 from ortools.sat.python import cp_model
 
 # Import modules
+import alternatives
+import batch
 import config
+import employee_store
 import optimizer
 import excel_writer
+import export_writer
+import feasibility
+import infeasibility
+import solution_cache
+import update_weekly_history
+from run_report import RunReport, report_path_for
 
 
+def build_solve_options():
+    """Collects the solver settings from config.py into a SolveOptions object."""
+    def report_solution(event):
+        print(f"  #{event.index + 1} [{event.wall_time:.2f}s] "
+              f"Penalty: {event.objective:g} (bound: {event.bound:g})")
+
+    return optimizer.SolveOptions(
+        num_workers=config.SOLVER_NUM_WORKERS,
+        max_time_seconds=config.SOLVER_MAX_TIME_SECONDS,
+        relative_gap=config.SOLVER_RELATIVE_GAP,
+        random_seed=config.SOLVER_RANDOM_SEED,
+        deterministic=config.SOLVER_DETERMINISTIC,
+        log_search_progress=config.SOLVER_LOG_PROGRESS,
+        on_solution=report_solution
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Weekly shift scheduler.")
+    parser.add_argument('--batch', metavar='DIR',
+                        help="solve every team file (*.json) in DIR in parallel instead of the employee store")
+    parser.add_argument('--output-dir', default='shift_schedule_output',
+                        help="where batch mode writes one schedule per team (default: %(default)s)")
+    parser.add_argument('--processes', type=int, default=None,
+                        help="concurrent batch jobs (default: one per core, capped by the number of teams)")
+    parser.add_argument('--format', dest='formats', action='append',
+                        choices=('xlsx',) + export_writer.FORMATS,
+                        help="output format, repeatable (default: config.OUTPUT_FORMATS)")
+    parser.add_argument('--alternatives', type=int, default=None, metavar='K',
+                        help="find the K best distinct rosters within config.ALTERNATIVES_MAX_GAP "
+                             "and write each to its own sheet")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="always solve, ignoring (and not updating) the solution cache")
+    return parser.parse_args()
+
 
 def main():
+    args = parse_args()
+    formats = args.formats or config.OUTPUT_FORMATS
+    if args.batch:
+        batch.run_batch(args.batch, args.output_dir, processes=args.processes, formats=formats)
+        return
+
     # --------------------------------------------------------
     # 1. HTML Parsing  (Optional)
     # --------------------------------------------------------
@@ -17,17 +68,55 @@ def main():
     # if image parsing is enabled, we need to inject the results
     # directly into the specific Employee objects.
 
-    # yalam_html_parser.update_constraints_from_html("yalam_table.html")
+    # update_weekly_constrains.update_constraints_from_html("yalam_table.html")
 
     # --------------------------------------------------------
     # 2. Run Optimization
     # --------------------------------------------------------
-    # The new optimizer signature only requires the employees list.
+    # The optimizer only requires the employees list, loaded from the employee store.
     # All constraints (manual assignments, history, unavailability) are already inside the objects.
 
+    report = RunReport()
+    with report.phase('load_employees'):
+        employees = employee_store.load_employees()
+
+    # Reject instances with obvious conflicts before paying for a solve
+    with report.phase('precheck'):
+        findings = feasibility.check_feasibility(employees)
+    if findings:
+        feasibility.print_findings(findings)
+        report.details['precheck'] = [str(finding) for finding in findings]
+        report.write(report_path_for(excel_writer.DEFAULT_OUTPUT_PATH))
+        return
+
+    # Optional warm start from last week's roster
+    previous_roster = None
+    if config.WARM_START_XLSX and os.path.exists(config.WARM_START_XLSX):
+        with report.phase('read_previous_roster'):
+            previous_roster = update_weekly_history.read_roster_from_excel(
+                config.WARM_START_XLSX, num_days=config.NUM_DAYS
+            )
+
+    if args.alternatives:
+        print(f"--- Searching for the {args.alternatives} best rosters ---")
+        found = alternatives.find_alternatives(employees, args.alternatives,
+                                               solve_options=build_solve_options(), report=report)
+        alternatives.print_alternatives(found)
+        if found and 'xlsx' in formats:
+            with report.phase('excel'):
+                excel_writer.create_alternatives_workbook(found, employees, config.NUM_DAYS, config.NUM_SHIFTS)
+        report.write(report_path_for(excel_writer.DEFAULT_ALTERNATIVES_PATH))
+        return
+
     print("--- Building and Solving Model ---")
-    solver, status, shift_vars = optimizer.build_and_solve_model(
-        employees=config.EMPLOYEES
+    solve_model = optimizer.build_and_solve_model
+    if config.SOLUTION_CACHE and not args.no_cache:
+        solve_model = solution_cache.cached_solve
+    solver, status, shift_vars = solve_model(
+        employees=employees,
+        solve_options=build_solve_options(),
+        previous_roster=previous_roster,
+        report=report
     )
 
     # --------------------------------------------------------
@@ -36,17 +125,29 @@ def main():
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
         print(f"\n✅ Solution Found! Cost (Penalty): {solver.ObjectiveValue()}")
 
-        # Pass the updated objects to the excel writer
-        excel_writer.create_excel_schedule(
+        # Styled workbook and/or plain tables for downstream systems
+        export_writer.write_outputs(
+            formats,
             solver=solver,
             shift_vars=shift_vars,
-            employees=config.EMPLOYEES,
+            employees=employees,
             num_days=config.NUM_DAYS,
             num_shifts=config.NUM_SHIFTS,
-            shifts_per_day_demand=config.SHIFTS_PER_DAY_DEMAND
+            xlsx_path=excel_writer.DEFAULT_OUTPUT_PATH,
+            output_prefix=export_writer.DEFAULT_OUTPUT_PREFIX,
+            report=report
         )
     else:
         print("\n❌ No feasible solution found. Try relaxing constraints.")
+        if status == cp_model.INFEASIBLE and config.EXPLAIN_INFEASIBILITY:
+            with report.phase('explain'):
+                conflict = infeasibility.explain_infeasibility(employees)
+            if conflict:
+                infeasibility.print_conflict(conflict)
+                report.details['conflict'] = conflict
+
+    # Timings, model size and solver statistics next to the outputs
+    report.write(report_path_for(excel_writer.DEFAULT_OUTPUT_PATH))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+# models.py
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+
+# ==========================================
+#         Data Models (Nested Structure)
+# ==========================================
+
+@dataclass
+class ContactDetails:
+    """Static details that do not affect the algorithm."""
+    phone: str = ""
+    email: str = ""
+
+
+@dataclass
+class ShiftPreferences:
+    """Numerical rules and constraints (Configuration)."""
+    max_shifts: int
+    target_shifts: int
+    max_nights: int
+    min_nights: int
+    max_mornings: int
+    min_mornings: int
+    max_evenings: int
+    min_evenings: int
+
+
+@dataclass
+class WeeklyState:
+    """Dynamic State - resets or updates every week."""
+    history_streak: int = 0
+    worked_last_fri_night: bool = False
+    worked_last_sat_noon: bool = False
+    worked_last_sat_night: bool = False
+    # Specific constraints for the current week
+    unavailable_shifts: List[Tuple[int, int]] = field(default_factory=list)
+    forced_shifts: List[Tuple[int, int]] = field(default_factory=list)
+
+
+@dataclass
+class Employee:
+    """Main Object - connects all components."""
+    id: int
+    name: str
+    color: str
+
+    # Composition
+    contact: ContactDetails
+    prefs: ShiftPreferences
+    state: WeeklyState
+
+    is_active: bool = True
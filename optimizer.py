@@ -1,204 +1,998 @@
+import time
+from dataclasses import astuple, dataclass, replace
+from typing import Callable, List, Optional
+
+import numpy as np
 from ortools.sat.python import cp_model
 import config
+import construction
+import demand as demand_rules
+import employee_store
+import shift_structure
+from run_report import RunReport
+
+
+# ==========================================
+#         Solver Options
+# ==========================================
+
+@dataclass
+class SolutionEvent:
+    """One improving solution reported while the search is running."""
+    index: int
+    wall_time: float
+    objective: float
+    bound: float
+
+
+@dataclass
+class SolveOptions:
+    """CP-SAT search parameters and anytime (time-budget) controls."""
+    num_workers: Optional[int] = None
+    max_time_seconds: Optional[float] = None
+    relative_gap: Optional[float] = None
+    random_seed: Optional[int] = None
+    # Reproducible runs: interleaved workers and a deterministic time limit
+    deterministic: bool = False
+    log_search_progress: bool = False
+    log_callback: Optional[Callable[[str], None]] = None
+    # Anytime mode: called for every improving solution
+    on_solution: Optional[Callable[[SolutionEvent], None]] = None
+    # Stop as soon as a roster with this penalty (or lower) is found
+    target_objective: Optional[float] = None
+
+
+class SolutionStreamer(cp_model.CpSolverSolutionCallback):
+    """
+    Records every improving solution with its objective and bound,
+    forwards it to the user hook and stops the search once the target is met.
+    """
+
+    def __init__(self, options: SolveOptions):
+        super().__init__()
+        self.options = options
+        self.events: List[SolutionEvent] = []
+
+    def on_solution_callback(self):
+        event = SolutionEvent(
+            index=len(self.events),
+            wall_time=self.WallTime(),
+            objective=self.ObjectiveValue(),
+            bound=self.BestObjectiveBound()
+        )
+        self.events.append(event)
+
+        if self.options.on_solution:
+            self.options.on_solution(event)
+
+        target = self.options.target_objective
+        if target is not None and event.objective <= target:
+            self.StopSearch()
+
+
+def configure_solver(options: SolveOptions) -> cp_model.CpSolver:
+    """Creates a CpSolver with the parameters requested in 'options'."""
+    solver = cp_model.CpSolver()
+    params = solver.parameters
+
+    if options.num_workers is not None:
+        params.num_workers = options.num_workers
+    if options.relative_gap is not None:
+        params.relative_gap_limit = options.relative_gap
+    if options.random_seed is not None:
+        params.random_seed = options.random_seed
+
+    if options.deterministic:
+        params.interleave_search = True
+        if options.max_time_seconds is not None:
+            params.max_deterministic_time = options.max_time_seconds
+    elif options.max_time_seconds is not None:
+        params.max_time_in_seconds = options.max_time_seconds
+
+    if options.log_search_progress or options.log_callback:
+        params.log_search_progress = True
+        # Keep the log off stdout when a callback consumes it
+        params.log_to_stdout = options.log_callback is None
+    if options.log_callback:
+        solver.log_callback = options.log_callback
+
+    return solver
+
+
+def solve(model, options: Optional[SolveOptions] = None):
+    """Solves 'model' with the given options, streaming improving solutions if requested."""
+    options = options or SolveOptions()
+    solver = configure_solver(options)
+
+    if options.on_solution or options.target_objective is not None:
+        status = solver.Solve(model, SolutionStreamer(options))
+    else:
+        status = solver.Solve(model)
+
+    return solver, status
+
+
+# ==========================================
+#         Availability (Sparse Pre-pass)
+# ==========================================
+
+def build_availability(employees, num_days, num_shifts, fold_requests=True, verbose=True):
+    """
+    Returns the sparse availability matrix {(e, d, s): 0 or 1} of every cell
+    already decided by inactivity, unavailability or a forced shift.
+    Cells missing from the dict are free and get a decision variable.
+    With fold_requests=False only inactive employees are fixed (used by the explain mode,
+    which adds unavailable/forced cells as guarded constraints instead).
+    verbose=False drops the line printed per forced shift.
+    """
+    structure = shift_structure.current_structure(num_days, num_shifts)
+    fixed = {}
+    for e_idx, emp in enumerate(employees):
 
+        # Inactive employees never work
+        if not emp.is_active:
+            for d in range(num_days):
+                for s in range(num_shifts):
+                    fixed[(e_idx, d, s)] = 0
+            continue
 
-def build_and_solve_model(employees):
-    num_employees = len(employees)
-    num_days = config.NUM_DAYS
-    num_shifts = config.NUM_SHIFTS
+        if not fold_requests:
+            continue
 
-    model = cp_model.CpModel()
+        # Too little rest after last week's final shifts (e.g. Sunday morning after a Saturday night)
+        blocked = set(emp.state.unavailable_shifts) | structure.carry_over_blocked(emp.state)
 
-    # --- Variables ---
+        for day, shift in blocked:
+            fixed[(e_idx, day, shift)] = 0
+
+        for day, shift in emp.state.forced_shifts:
+            # internal validation
+            if (day, shift) in blocked:
+                raise ValueError(
+                    f"CRITICAL ERROR: {emp.name} is forced to work (Day {day}, Shift {shift}) but is marked unavailable!")
+
+            if verbose:
+                print(f"Forcing assignment: {emp.name} -> Day {day} Shift {shift}")
+            fixed[(e_idx, day, shift)] = 1
+
+    return fixed
+
+
+def is_fixed(lit):
+    """True for cells that were folded into constants by the availability pre-pass."""
+    return isinstance(lit, int)
+
+
+def add_constraint(model, constraint, enforce=None):
+    """
+    model.Add() that tolerates constraints made only of constants:
+    a satisfied one is dropped, a violated one makes the model infeasible
+    (or falsifies 'enforce', the optional enforcement literal).
+    """
+    if isinstance(constraint, bool):
+        if not constraint:
+            model.AddBoolOr([enforce.Not()] if enforce is not None else [])
+        return None
+    ct = model.Add(constraint)
+    if enforce is not None:
+        ct.OnlyEnforceIf(enforce)
+    return ct
+
+
+def linear_sum(terms):
+    """
+    Flat sum of shift cells and expressions: fixed cells are folded into one
+    constant and the variables go into a single LinearExpr.Sum node instead of
+    the nested tree Python's sum() builds.
+    """
+    constant = 0
+    variables = []
+    for term in terms:
+        if is_fixed(term):
+            constant += term
+        else:
+            variables.append(term)
+
+    if not variables:
+        return constant
+    expr = cp_model.LinearExpr.Sum(variables)
+    return expr + constant if constant else expr
+
+
+def weighted_sum(terms, coefficients):
+    """Flat weighted sum with the same constant folding as linear_sum."""
+    constant = 0
+    variables = []
+    weights = []
+    for term, coef in zip(terms, coefficients):
+        if is_fixed(term):
+            constant += term * coef
+        else:
+            variables.append(term)
+            weights.append(coef)
+
+    if not variables:
+        return constant
+    expr = cp_model.LinearExpr.WeightedSum(variables, weights)
+    return expr + constant if constant else expr
+
+
+# Soft-constraint encodings: 'lean' (one-way implications) or 'reified' (legacy two-way)
+ENCODINGS = ('lean', 'reified')
+
+
+def and_penalty(model, literals, name, encoding='lean'):
+    """
+    Returns a penalty literal for AND(literals), folding fixed cells:
+    a constant when the result is decided, the literal itself when only one is free.
+
+    'lean' only forces the penalty up (AND(literals) -> penalty) with a single clause,
+    which is enough because penalties are minimized. 'reified' keeps the legacy
+    two-way AddBoolAnd/AddBoolOr pair and exists to compare the two encodings.
+    """
+    if any(is_fixed(lit) and lit == 0 for lit in literals):
+        return 0
+    free = [lit for lit in literals if not is_fixed(lit)]
+    if not free:
+        return 1
+    if len(free) == 1:
+        return free[0]
+
+    result = model.NewBoolVar(name)
+    if encoding == 'lean':
+        model.AddBoolOr([lit.Not() for lit in free] + [result])
+    else:
+        model.AddBoolAnd(free).OnlyEnforceIf(result)
+        model.AddBoolOr([lit.Not() for lit in free]).OnlyEnforceIf(result.Not())
+    return result
+
+
+def solution_array(solver, shift_vars, num_employees, num_days, num_shifts):
+    """
+    Reads the solved roster once into a dense (employees x days x shifts) uint8 array.
+    Free cells are gathered with one fancy-indexing step over the raw solution vector;
+    fixed cells are copied from their constants.
+    """
+    assignment = np.zeros((num_employees, num_days, num_shifts), dtype=np.uint8)
+    free_cells, var_indices = [], []
+    for key, var in shift_vars.items():
+        if is_fixed(var):
+            assignment[key] = var
+        else:
+            free_cells.append(key)
+            var_indices.append(var.Index())
+
+    if free_cells:
+        values = np.asarray(solver.ResponseProto().solution, dtype=np.int64)[var_indices]
+        e_idx, d_idx, s_idx = np.array(free_cells).T
+        assignment[e_idx, d_idx, s_idx] = values
+    return assignment
+
+
+def roster_from_array(employees, assignment):
+    """(employees x days x shifts) array -> {employee_id: set of (day, shift)}, the warm-start format."""
+    return {emp.id: {(int(d), int(s)) for d, s in zip(*assignment[e_idx].nonzero())}
+            for e_idx, emp in enumerate(employees) if assignment[e_idx].any()}
+
+
+# ==========================================
+#         Warm Start
+# ==========================================
+
+def repair_hint_shifts(emp, hinted_shifts, num_days, num_shifts):
+    """
+    Adapts last week's shifts of one employee to this week's hard rules:
+    forced shifts are added, unavailable cells dropped, and the rest is
+    trimmed to one shift per day, the minimum rest and max_shifts per period.
+    """
+    structure = shift_structure.current_structure(num_days, num_shifts)
+    periods = structure.periods()
+    blocked = set(emp.state.unavailable_shifts) | structure.carry_over_blocked(emp.state)
+
+    forced = sorted(set(emp.state.forced_shifts))
+    candidates = forced + sorted(set(hinted_shifts) - blocked - set(forced))
+
+    kept = set()
+    per_period = [0] * len(periods)
+    for day, shift in candidates:
+        if not (0 <= day < num_days and 0 <= shift < num_shifts):
+            continue
+        p = structure.period_of(day)
+        if per_period[p] >= structure.scale(emp.prefs.max_shifts, periods[p]) and (day, shift) not in forced:
+            continue
+        clashes = any(structure.too_close((day, shift), cell) for cell in kept)
+        if not clashes:
+            kept.add((day, shift))
+            per_period[p] += 1
+
+    return kept
+
+
+def add_warm_start_hints(model, shift_vars, employees, previous_roster, num_days, num_shifts):
+    """
+    Hints the solver with last week's roster ({employee_id: set of (day, shift)}),
+    repaired against this week's availability. Returns a summary of surviving hints.
+    """
+    report = {'employees': 0, 'hinted': 0, 'survived': 0}
+
+    for e_idx, emp in enumerate(employees):
+        if not emp.is_active or emp.id not in previous_roster:
+            continue
+
+        hinted = previous_roster[emp.id]
+        kept = repair_hint_shifts(emp, hinted, num_days, num_shifts)
+
+        report['employees'] += 1
+        report['hinted'] += len(hinted)
+        report['survived'] += len(kept & set(hinted))
+
+        for d in range(num_days):
+            for s in range(num_shifts):
+                var = shift_vars[(e_idx, d, s)]
+                if not is_fixed(var):
+                    model.AddHint(var, (d, s) in kept)
+
+    print(f"💡 Warm start: {report['survived']}/{report['hinted']} hinted shifts survived "
+          f"for {report['employees']} employees.")
+    return report
+
+
+# ==========================================
+#         Model
+# ==========================================
+
+def create_shift_vars(model, employees, fixed, num_days, num_shifts):
+    """One BoolVar per free (employee, day, shift) cell; fixed cells keep their 0/1 constant."""
     shift_vars = {}
-    for e in range(num_employees):
+    for e in range(len(employees)):
         for d in range(num_days):
             for s in range(num_shifts):
-                shift_vars[(e, d, s)] = model.NewBoolVar(f'shift_{e}_{d}_{s}')
+                if (e, d, s) in fixed:
+                    shift_vars[(e, d, s)] = fixed[(e, d, s)]
+                else:
+                    shift_vars[(e, d, s)] = model.NewBoolVar(f'shift_{e}_{d}_{s}')
+    return shift_vars
 
-    # ----------------------- #
-    # --- Hard Constraints ---#
-    # ----------------------- #
-    # A. Demand (Exact number of workers per shift)
-    for d in range(num_days):
-        for s in range(num_shifts):
-            model.Add(sum(shift_vars[(e, d, s)] for e in range(num_employees) if
-                          employees[e].is_active) == config.SHIFTS_PER_DAY_DEMAND)
+
+def no_guard(group):
+    """Default for add_hard_constraints: hard rules are always enforced."""
+    return None
+
+
+def add_hard_constraints(model, employees, shift_vars, num_days, num_shifts, encoding, report, guard=no_guard):
+    """
+    Adds the hard rules (demand, minimum rest, streak, shift caps).
+    'guard(group)' may return an enforcement literal for a named constraint group
+    ('demand:d{day}_s{shift}', 'streak:{name}', 'max_shifts:{name}'), used by the explain mode.
+    Returns the UNDERSTAFFING objective terms of the cells with a demand range.
+    """
+    num_employees = len(employees)
+    demand = demand_rules.demand_matrix(num_days, num_shifts)
+    objective_terms = []
+    structure = shift_structure.current_structure(num_days, num_shifts)
+    rest_pairs = structure.hard_rest_pairs()
+    periods = structure.periods()
+    window = config.MAX_CONSECUTIVE_DAYS + 1
+
+    # A. Demand (Exact number of workers per shift, or a range with a penalty per missing worker)
+    with report.phase('demand', model):
+        for d in range(num_days):
+            for s in range(num_shifts):
+                workers = linear_sum(shift_vars[(e, d, s)] for e in range(num_employees) if employees[e].is_active)
+                low, high = int(demand.minimum[d, s]), int(demand.maximum[d, s])
+                if low == high:
+                    add_constraint(model, workers == high, guard(f'demand:d{d}_s{s}'))
+                    continue
+                enforce = guard(f'demand:d{d}_s{s}')
+                add_constraint(model, workers >= low, enforce)
+                add_constraint(model, workers <= high, enforce)
+                understaffed = model.NewIntVar(0, high - low, f'understaffed_{d}_{s}')
+                add_constraint(model, workers + understaffed >= high, enforce)
+                objective_terms.append((understaffed, 'UNDERSTAFFING'))
 
     # LOOP PER EMPLOYEE
     for e_idx, emp in enumerate(employees):
 
-        # Skip inactive employees entirely (force all their shifts to 0)
+        # Skip inactive employees entirely (their shifts are fixed to 0)
         if not emp.is_active:
-            for d in range(num_days):
-                for s in range(num_shifts):
-                    model.Add(shift_vars[(e_idx, d, s)] == 0)
             continue
 
-        # B. Prevent back-to-back shifts (Global logic, same as before)
-        for total_s in range(num_days * num_shifts - 1):
-            day = total_s // num_shifts
-            shift = total_s % num_shifts
-            next_total_s = total_s + 1
-            next_day = next_total_s // num_shifts
-            next_shift = next_total_s % num_shifts
-            model.Add(shift_vars[(e_idx, day, shift)] + shift_vars[(e_idx, next_day, next_shift)] <= 1)
+        # B. Minimum rest between shifts on different days (e.g. no night followed by the next morning)
+        with report.phase('back_to_back', model):
+            for first, second, offset in rest_pairs:
+                for d in range(num_days - offset):
+                    add_constraint(model,
+                                   shift_vars[(e_idx, d, first)] + shift_vars[(e_idx, d + offset, second)] <= 1)
 
-        # Assign unavailable_requests
-        for day, shift in emp.state.unavailable_shifts:
-            model.Add(shift_vars[(e_idx, day, shift)] == 0)
+        # F. Max Streak ( uses 'emp.state.history_streak')
+        with report.phase('streak', model):
+            work_days_vars = []
+            for d in range(num_days):
+                day_cells = [shift_vars[(e_idx, d, s)] for s in range(num_shifts)]
+                free_cells = [c for c in day_cells if not is_fixed(c)]
+                if any(is_fixed(c) and c == 1 for c in day_cells):
+                    work_days_vars.append(1)
+                    continue
+                if not free_cells:
+                    work_days_vars.append(0)
+                    continue
+                if encoding == 'lean':
+                    # At most one shift per day (rule G), so the day's sum already is the working flag
+                    work_days_vars.append(linear_sum(free_cells))
+                    continue
+                is_working_day = model.NewBoolVar(f'working_day_{e_idx}_{d}')
+                model.Add(linear_sum(free_cells) > 0).OnlyEnforceIf(is_working_day)
+                model.Add(linear_sum(free_cells) == 0).OnlyEnforceIf(is_working_day.Not())
+                work_days_vars.append(is_working_day)
+
+            # No run of more than MAX_CONSECUTIVE_DAYS working days, counting last week's streak:
+            # the first window starts inside last week, the others slide over the horizon
+            first_window = 0
+            streak = emp.state.history_streak
+            if streak > 0:
+                limit = window - streak
+                if limit <= num_days and limit > 0:
+                    add_constraint(model, linear_sum(work_days_vars[0:limit]) < limit, guard(f'streak:{emp.name}'))
+                    first_window = 1  # The window starting on day 0 is implied
+            for start in range(first_window, num_days - window + 1):
+                add_constraint(model, linear_sum(work_days_vars[start:start + window]) < window,
+                               guard(f'streak:{emp.name}'))
+
+        # G. Max one shift per day (Standard logic) and max_shifts per period
+        with report.phase('shift_caps', model):
+            for d in range(num_days):
+                add_constraint(model, linear_sum(shift_vars[(e_idx, d, s)] for s in range(num_shifts)) <= 1)
 
-        if emp.state.worked_last_sat_night:
-            model.Add(shift_vars[(e_idx, 0, 0)] == 0)  # Cannot work Sunday morning
+            for period in periods:
+                shifts_flat = [shift_vars[(e_idx, d, s)] for d in period for s in range(num_shifts)]
+                add_constraint(model, linear_sum(shifts_flat) <= structure.scale(emp.prefs.max_shifts, period),
+                               guard(f'max_shifts:{emp.name}'))
 
-        for day, shift in emp.state.forced_shifts:
-            # internal validation
-            if (day, shift) in emp.state.unavailable_shifts:
-                raise ValueError(
-                    f"CRITICAL ERROR: {emp.name} is forced to work (Day {day}, Shift {shift}) but is marked unavailable!")
+    return objective_terms
 
-            print(f"Forcing assignment: {emp.name} -> Day {day} Shift {shift}")
-            model.Add(shift_vars[(e_idx, day, shift)] == 1)
 
-        # F. Max Streak ( uses 'emp.state.history_streak')
-        work_days_vars = []
-        for d in range(num_days):
-            is_working_day = model.NewBoolVar(f'working_day_{e_idx}_{d}')
-            model.Add(sum(shift_vars[(e_idx, d, s)] for s in range(num_shifts)) > 0).OnlyEnforceIf(is_working_day)
-            model.Add(sum(shift_vars[(e_idx, d, s)] for s in range(num_shifts)) == 0).OnlyEnforceIf(
-                is_working_day.Not())
-            work_days_vars.append(is_working_day)
-
-        streak = emp.state.history_streak
-        if streak > 0:
-            limit = 7 - streak
-            if limit <= num_days and limit > 0:
-                model.Add(sum(work_days_vars[0:limit]) < limit)
-        if streak == 0:
-            model.Add(sum(work_days_vars) < 7)
-
-        # G. Max one shift per day (Standard logic)
-        for d in range(num_days):
-            model.Add(sum(shift_vars[(e_idx, d, s)] for s in range(num_shifts)) <= 1)
+# Preferences per shift kind: (kind, max field, min field, max weight, min weight)
+KIND_PREFERENCES = [
+    ('night', 'max_nights', 'min_nights', 'MAX_NIGHTS', 'MIN_NIGHTS'),
+    ('morning', 'max_mornings', 'min_mornings', 'MAX_MORNINGS', 'MIN_MORNINGS'),
+    ('evening', 'max_evenings', 'min_evenings', 'MAX_EVENINGS', 'MIN_EVENINGS'),
+]
 
-        shifts_flat = [shift_vars[(e_idx, d, s)] for d in range(num_days) for s in range(num_shifts)]
-        model.Add(sum(shifts_flat) <= emp.prefs.max_shifts)
 
-    # -------------------------------------- #
-    # --- Soft Constraints (Optimization) ---#
-    # -------------------------------------- #
-    w = config.WEIGHTS
+def night_flags(model, shift_vars, e_idx, num_days, night_shifts):
+    """Per day, the literal 'works a night shift' (a sum of at most one cell when there are several night types)."""
+    if len(night_shifts) == 1:
+        return [shift_vars[(e_idx, d, night_shifts[0])] for d in range(num_days)]
+
+    flags = []
+    for d in range(num_days):
+        cells = [shift_vars[(e_idx, d, s)] for s in night_shifts]
+        total = linear_sum(cells)
+        if is_fixed(total):
+            flags.append(total)
+            continue
+        flag = model.NewBoolVar(f'night_{e_idx}_{d}')
+        model.Add(total == flag)
+        flags.append(flag)
+    return flags
+
+
+def add_soft_constraints(model, employees, shift_vars, num_days, num_shifts, encoding, report):
+    """
+    Adds the penalized preferences and returns the objective as a list of
+    (penalty term, WEIGHTS key) pairs.
+    """
+    structure = shift_structure.current_structure(num_days, num_shifts)
+    periods = structure.periods()
+    kinds = {kind: structure.shifts_of_kind(kind) for kind, *_ in KIND_PREFERENCES}
+    short_rest_pairs = structure.short_rest_pairs()
+    night_window = config.MAX_CONSECUTIVE_NIGHTS + 1
+
+    # Combined into one WeightedSum by build_model
     objective_terms = []
 
     for e_idx, emp in enumerate(employees):
         if not emp.is_active: continue
 
-        # Helpers
-        morning_shifts = [shift_vars[(e_idx, d, 0)] for d in range(num_days)]
-        evening_shifts = [shift_vars[(e_idx, d, 1)] for d in range(num_days)]
-        night_shifts = [shift_vars[(e_idx, d, 2)] for d in range(num_days)]
-        emp_shifts = morning_shifts + evening_shifts + night_shifts
+        with report.phase('min_max', model):
+            for p, period in enumerate(periods):
+                totals = {kind: linear_sum(shift_vars[(e_idx, d, s)] for d in period for s in shifts)
+                          for kind, shifts in kinds.items() if shifts}
+
+                # Max Constraints
+                for kind, max_field, _, max_key, _ in KIND_PREFERENCES:
+                    if kind not in totals:
+                        continue
+                    excess = model.NewIntVar(0, len(period), f'excess_{kind}s_{e_idx}_{p}')
+                    limit = structure.scale(getattr(emp.prefs, max_field), period)
+                    add_constraint(model, totals[kind] <= limit + excess)
+                    objective_terms.append((excess, max_key))
+
+                # Min Constraints
+                for kind, _, min_field, _, min_key in KIND_PREFERENCES:
+                    if kind not in totals:
+                        continue
+                    shortage = model.NewIntVar(0, len(period), f'shortage_{kind}s_{e_idx}_{p}')
+                    minimum = structure.scale(getattr(emp.prefs, min_field), period)
+                    add_constraint(model, totals[kind] + shortage >= minimum)
+                    objective_terms.append((shortage, min_key))
 
-        # Max Constraints
-        excess_nights = model.NewIntVar(0, 7, f'excess_nights_{e_idx}')
-        model.Add(sum(night_shifts) <= emp.prefs.max_nights + excess_nights)
-        objective_terms.append(excess_nights * w['MAX_NIGHTS'])
+        # Logic and Rest (Consecutive Nights)
+        with report.phase('consecutive_nights', model):
+            if kinds['night']:
+                nights = night_flags(model, shift_vars, e_idx, num_days, kinds['night'])
+
+                # 1. Every run of MAX_CONSECUTIVE_NIGHTS + 1 nights inside the horizon
+                for d in range(num_days - night_window + 1):
+                    is_long_run = and_penalty(model, nights[d:d + night_window], f'3nights_{e_idx}_{d}', encoding)
+                    objective_terms.append((is_long_run, 'CONSECUTIVE_NIGHTS'))
+
+                # 2. HIDDEN SEQUENCES: a run that started with last Friday/Saturday night
+                # (Fri+Sat -> Sunday night alone completes it, Sat only -> Sunday and Monday nights)
+                history = min(structure.history_nights(emp.state), night_window - 1)
+                if history > 0:
+                    is_continued_run = and_penalty(model, nights[0:night_window - history],
+                                                   f'3nights_cont_{e_idx}', encoding)
+                    objective_terms.append((is_continued_run, 'CONSECUTIVE_NIGHTS'))
+
+        # Rest Gap: shifts on different days with less than PREFERRED_REST_HOURS between them
+        with report.phase('rest_gap', model):
+            for first, second, offset in short_rest_pairs:
+                for d in range(num_days - offset):
+                    both_working = and_penalty(model,
+                                               [shift_vars[(e_idx, d, first)], shift_vars[(e_idx, d + offset, second)]],
+                                               f'bad_gap_{e_idx}_{d}_{first}_{second}', encoding)
+                    objective_terms.append((both_working, 'REST_GAP'))
+
+            # CHANGE 10: Previous week rest gap using 'emp.state'
+            for day, shift in structure.carry_over_short_rest(emp.state):
+                objective_terms.append((shift_vars[(e_idx, day, shift)], 'REST_GAP'))
 
-        excess_mornings = model.NewIntVar(0, 7, f'excess_mornings_{e_idx}')
-        model.Add(sum(morning_shifts) <= emp.prefs.max_mornings + excess_mornings)
-        objective_terms.append(excess_mornings * w['MAX_MORNINGS'])
+        # Target Shifts using 'emp.prefs'
+        with report.phase('target', model):
+            for p, period in enumerate(periods):
+                total_worked = linear_sum(shift_vars[(e_idx, d, s)] for d in period for s in range(num_shifts))
+                target = structure.scale(emp.prefs.target_shifts, period)
+                delta = model.NewIntVar(0, len(period) * num_shifts, f'delta_target_{e_idx}_{p}')
+                model.Add(total_worked - target <= delta)
+                model.Add(target - total_worked <= delta)
+                objective_terms.append((delta, 'TARGET_SHIFTS'))
 
-        excess_evenings = model.NewIntVar(0, 7, f'excess_evenings_{e_idx}')
-        model.Add(sum(evening_shifts) <= emp.prefs.max_evenings + excess_evenings)
-        objective_terms.append(excess_evenings * w['MAX_EVENINGS'])
+    return objective_terms
 
-        # Min Constraints
-        shortage_nights = model.NewIntVar(0, 7, f'shortage_nights_{e_idx}')
-        model.Add(sum(night_shifts) + shortage_nights >= emp.prefs.min_nights)
-        objective_terms.append(shortage_nights * w['MIN_NIGHTS'])
 
-        shortage_mornings = model.NewIntVar(0, 7, f'shortage_mornings_{e_idx}')
-        model.Add(sum(morning_shifts) + shortage_mornings >= emp.prefs.min_mornings)
-        objective_terms.append(shortage_mornings * w['MIN_MORNINGS'])
+def equivalence_key(emp):
+    """Everything the model reads from an employee: equal keys mean interchangeable employees."""
+    state = tuple(frozenset(map(tuple, value)) if isinstance(value, list) else value
+                  for value in vars(emp.state).values())
+    return astuple(emp.prefs), state
 
-        shortage_evenings = model.NewIntVar(0, 7, f'shortage_evenings_{e_idx}')
-        model.Add(sum(evening_shifts) + shortage_evenings >= emp.prefs.min_evenings)
-        objective_terms.append(shortage_evenings * w['MIN_EVENINGS'])
 
-        # Logic and Rest (Consecutive Nights)
-        # 1. Standard check within the current week (Sunday to Saturday)
-        for d in range(num_days - 2):
-            is_three_nights = model.NewBoolVar(f'3nights_{e_idx}_{d}')
-            model.AddBoolAnd([
-                shift_vars[(e_idx, d, 2)],
-                shift_vars[(e_idx, d + 1, 2)],
-                shift_vars[(e_idx, d + 2, 2)]
-            ]).OnlyEnforceIf(is_three_nights)
-
-            model.AddBoolOr([
-                shift_vars[(e_idx, d, 2)].Not(),
-                shift_vars[(e_idx, d + 1, 2)].Not(),
-                shift_vars[(e_idx, d + 2, 2)].Not()
-            ]).OnlyEnforceIf(is_three_nights.Not())
-
-            objective_terms.append(is_three_nights * w['CONSECUTIVE_NIGHTS'])
-
-        # 2. HIDDEN SEQUENCES: Check continuation from last Friday/Saturday
-
-        # Case A: Worked Friday Night AND Saturday Night -> Penalize Sunday Night
-        if emp.state.worked_last_fri_night and emp.state.worked_last_sat_night:
-            is_3rd_night_sun = model.NewBoolVar(f'3nights_cont_sun_{e_idx}')
-            # If they work Sunday Night (Day 0, Shift 2), it's the 3rd consecutive night
-            model.Add(shift_vars[(e_idx, 0, 2)] == 1).OnlyEnforceIf(is_3rd_night_sun)
-            model.Add(shift_vars[(e_idx, 0, 2)] == 0).OnlyEnforceIf(is_3rd_night_sun.Not())
-            objective_terms.append(is_3rd_night_sun * w['CONSECUTIVE_NIGHTS'])
-
-        # Case B: Worked ONLY Saturday Night -> Penalize Sun+Mon sequence
-        elif emp.state.worked_last_sat_night:
-            is_3night_sequence_start = model.NewBoolVar(f'3nights_cont_sun_mon_{e_idx}')
-            # If they work Sunday AND Monday nights, it's the 3rd night in a row
-            model.AddBoolAnd([
-                shift_vars[(e_idx, 0, 2)],
-                shift_vars[(e_idx, 1, 2)]
-            ]).OnlyEnforceIf(is_3night_sequence_start)
-
-            model.AddBoolOr([
-                shift_vars[(e_idx, 0, 2)].Not(),
-                shift_vars[(e_idx, 1, 2)].Not()
-            ]).OnlyEnforceIf(is_3night_sequence_start.Not())
-            objective_terms.append(is_3night_sequence_start * w['CONSECUTIVE_NIGHTS'])
-
-        # Rest Gap
-        for total_s in range(num_days * num_shifts - 2):
-            day = total_s // num_shifts
-            shift = total_s % num_shifts
-            t_total_s = total_s + 2
-            t_day = t_total_s // num_shifts
-            t_shift = t_total_s % num_shifts
-            both_working = model.NewBoolVar(f'bad_gap_{e_idx}_{total_s}')
-            model.AddBoolAnd([shift_vars[(e_idx, day, shift)], shift_vars[(e_idx, t_day, t_shift)]]).OnlyEnforceIf(
-                both_working)
-            model.AddBoolOr(
-                [shift_vars[(e_idx, day, shift)].Not(), shift_vars[(e_idx, t_day, t_shift)].Not()]).OnlyEnforceIf(
-                both_working.Not())
-            objective_terms.append(both_working * w['REST_GAP'])
-
-        # CHANGE 10: Previous week rest gap using 'emp.state'
-        if emp.state.worked_last_sat_noon:
-            objective_terms.append(shift_vars[(e_idx, 0, 0)] * w['REST_GAP'])
-        if emp.state.worked_last_sat_night:
-            objective_terms.append(shift_vars[(e_idx, 0, 1)] * w['REST_GAP'])
+def equivalence_groups(employees):
+    """Groups (lists of indices, in order) of two or more active employees with the same prefs and state."""
+    groups = {}
+    for e_idx, emp in enumerate(employees):
+        if emp.is_active:
+            groups.setdefault(equivalence_key(emp), []).append(e_idx)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def add_lex_leq(model, smaller, larger, name):
+    """
+    smaller <=lex larger over two lists of shift cells. Positions where both are constants are
+    skipped: interchangeable employees share their fixed cells, so the rest are pairs of variables.
+    equal_k means 'equal on every position before k'; while it holds larger[k] >= smaller[k],
+    and staying equal on position k carries it over to equal_(k+1).
+    """
+    pairs = [(a, b) for a, b in zip(smaller, larger) if not (is_fixed(a) and is_fixed(b))]
+    prefix = []  # Empty while the prefix is trivially equal, then [not equal_k]
+    for k, (a, b) in enumerate(pairs):
+        model.AddBoolOr(prefix + [a.Not(), b])
+        if k == len(pairs) - 1:
+            break
+        equal = model.NewBoolVar(f'{name}_eq_{k}')
+        model.AddBoolOr(prefix + [a, b, equal])
+        model.AddBoolOr(prefix + [a.Not(), b.Not(), equal])
+        prefix = [equal.Not()]
+
+
+def add_symmetry_breaking(model, employees, shift_vars, num_days, num_shifts):
+    """
+    Orders the rosters of interchangeable employees lexicographically, so the search does
+    not revisit the same roster with two equivalent employees swapped. Returns the groups.
+    """
+    groups = equivalence_groups(employees)
+    for group in groups:
+        for first, second in zip(group, group[1:]):
+            cells = [(d, s) for d in range(num_days) for s in range(num_shifts)]
+            add_lex_leq(model,
+                        [shift_vars[(second, d, s)] for d, s in cells],
+                        [shift_vars[(first, d, s)] for d, s in cells],
+                        f'lex_{first}_{second}')
+    return groups
+
+
+def order_hints_for_symmetry(employees, previous_roster, groups, num_days, num_shifts):
+    """
+    Rewrites a warm-start roster so it agrees with add_symmetry_breaking: inside each group
+    of interchangeable employees, the hinted rows (after repair_hint_shifts, which treats
+    them alike) are handed out in lexicographically descending order. Otherwise a last-week
+    or greedy roster gives CP-SAT a complete but infeasible hint.
+    """
+    cells = [(d, s) for d in range(num_days) for s in range(num_shifts)]
+    ordered = dict(previous_roster)
+    for group in groups:
+        members = [employees[e_idx] for e_idx in group if employees[e_idx].id in previous_roster]
+        rows = [repair_hint_shifts(emp, previous_roster[emp.id], num_days, num_shifts) for emp in members]
+        rows.sort(key=lambda row: [cell in row for cell in cells], reverse=True)
+        for emp, row in zip(members, rows):
+            ordered[emp.id] = row
+    return ordered
+
+
+def build_model_terms(employees, previous_roster=None, encoding=None, report=None, symmetry_breaking=None,
+                      frozen=None, availability=None):
+    """
+    Builds every constraint of the weekly model but no objective, and returns
+    (model, shift_vars, objective_terms) with the (penalty term, WEIGHTS key) pairs.
+    'frozen' ({(e, d, s): 0 or 1}) fixes more cells on top of the availability pre-pass; a
+    frozen cell that contradicts it (work while unavailable, a forced shift left out) makes
+    the model infeasible. 'availability' re-uses a build_availability result computed
+    once for many models. See build_model for the other arguments.
+    """
+    if symmetry_breaking is None:
+        symmetry_breaking = config.SYMMETRY_BREAKING
+    encoding = encoding or config.SOFT_CONSTRAINT_ENCODING
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown soft-constraint encoding '{encoding}', expected one of {ENCODINGS}")
+    report = report or RunReport()
 
-        # Target Shifts using 'emp.prefs'
-        total_worked = sum(emp_shifts)
-        delta = model.NewIntVar(0, 21, f'delta_target_{e_idx}')
-        model.Add(total_worked - emp.prefs.target_shifts <= delta)
-        model.Add(emp.prefs.target_shifts - total_worked <= delta)
-        objective_terms.append(delta * w['TARGET_SHIFTS'])
-
-    # --- Solve ---
-    model.Minimize(sum(objective_terms))
-    solver = cp_model.CpSolver()
-    status = solver.Solve(model)
+    num_days = config.NUM_DAYS
+    num_shifts = config.NUM_SHIFTS
 
-    return solver, status, shift_vars
\ No newline at end of file
+    model = cp_model.CpModel()
+
+    # --- Variables ---
+    # Only free cells become decision variables; fixed cells stay 0/1 constants
+    with report.phase('variables', model):
+        fixed = availability if availability is not None else build_availability(employees, num_days, num_shifts)
+        if frozen:
+            # Neither side may win silently: a conflict is a broken hard rule of the frozen roster
+            conflicts = sorted(cell for cell, value in frozen.items() if cell in fixed and fixed[cell] != value)
+            if conflicts:
+                report.details['frozen_conflicts'] = [list(cell) for cell in conflicts]
+                add_constraint(model, False)
+            fixed = {**frozen, **fixed}
+        shift_vars = create_shift_vars(model, employees, fixed, num_days, num_shifts)
+
+    # ----------------------- #
+    # --- Hard Constraints ---#
+    # ----------------------- #
+    # (Unavailable, forced and post-Saturday-night cells are fixed by build_availability)
+    staffing_terms = add_hard_constraints(model, employees, shift_vars, num_days, num_shifts, encoding, report)
+
+    # -------------------------------------- #
+    # --- Soft Constraints (Optimization) ---#
+    # -------------------------------------- #
+    objective_terms = staffing_terms + add_soft_constraints(model, employees, shift_vars, num_days, num_shifts,
+                                                            encoding, report)
+
+    # --- Symmetry breaking between interchangeable employees (Optional) ---
+    if symmetry_breaking:
+        with report.phase('symmetry', model):
+            groups = add_symmetry_breaking(model, employees, shift_vars, num_days, num_shifts)
+        report.details['symmetry'] = {
+            'groups': len(groups),
+            'employees': sum(len(group) for group in groups)
+        }
+
+    # --- Warm Start (Optional) ---
+    if previous_roster:
+        with report.phase('warm_start'):
+            if symmetry_breaking:
+                previous_roster = order_hints_for_symmetry(employees, previous_roster, groups, num_days, num_shifts)
+            report.details['warm_start'] = add_warm_start_hints(
+                model, shift_vars, employees, previous_roster, num_days, num_shifts)
+
+    return model, shift_vars, objective_terms
+
+
+def objective_expression(objective_terms, weights=None):
+    """The weighted sum of (term, WEIGHTS key) pairs; 'weights' overrides config.WEIGHTS."""
+    w = weights or config.WEIGHTS
+    return weighted_sum([term for term, _ in objective_terms], [w[key] for _, key in objective_terms])
+
+
+def set_objective(model, objective_terms, weights=None):
+    """Minimizes the weighted sum of (term, WEIGHTS key) pairs; 'weights' overrides config.WEIGHTS."""
+    model.Minimize(objective_expression(objective_terms, weights))
+
+
+def penalty_breakdown(solver, objective_terms, weights=None):
+    """Weighted penalty per WEIGHTS key in the solved roster, e.g. {'TARGET_SHIFTS': 120, ...}."""
+    w = weights or config.WEIGHTS
+    breakdown = {}
+    for term, key in objective_terms:
+        value = term if is_fixed(term) else solver.Value(term)
+        breakdown[key] = breakdown.get(key, 0) + w[key] * value
+    return breakdown
+
+
+def build_model(employees, previous_roster=None, encoding=None, report=None, symmetry_breaking=None):
+    """
+    Builds the weekly CP-SAT model and returns (model, shift_vars).
+    'previous_roster' ({employee_id: set of (day, shift)}) optionally warm-starts the search,
+    'encoding' overrides config.SOFT_CONSTRAINT_ENCODING, 'symmetry_breaking' overrides
+    config.SYMMETRY_BREAKING and 'report' (a RunReport) collects the time, variables and
+    constraints spent on each constraint family.
+    """
+    report = report or RunReport()
+    model, shift_vars, objective_terms = build_model_terms(
+        employees, previous_roster=previous_roster, encoding=encoding, report=report,
+        symmetry_breaking=symmetry_breaking
+    )
+    with report.phase('objective'):
+        set_objective(model, objective_terms)
+    return model, shift_vars
+
+
+# ==========================================
+#         Lexicographic Objective
+# ==========================================
+
+def lexicographic_stages(objective_terms, stages=None):
+    """
+    Splits the (term, WEIGHTS key) pairs into the configured priority groups
+    (default config.LEXICOGRAPHIC_STAGES); keys of no group are left to the final stage.
+    """
+    stages = config.LEXICOGRAPHIC_STAGES if stages is None else stages
+    present = {key for _, key in objective_terms}
+    return [[(term, key) for term, key in objective_terms if key in group]
+            for group in stages if present & set(group)]
+
+
+def hint_solution(model, solver):
+    """Hints every variable of 'model' with its value in the last solution of 'solver'."""
+    solution = solver.ResponseProto().solution
+    model.ClearHints()
+    hint = model.Proto().solution_hint
+    hint.vars.extend(range(len(solution)))
+    hint.values.extend(solution)
+
+
+def total_of_incumbent(model, objective_terms, solver, shift_vars, max_time_seconds=None):
+    """
+    Re-solves 'model' under the full weighted objective with every shift fixed to the roster
+    of 'solver' (only the penalty slacks are left), so a roster found by a partial objective
+    reports its total penalty. Returns (solver, FEASIBLE): that roster is not proven optimal.
+    """
+    model.Minimize(objective_expression(objective_terms))
+    model.ClearHints()
+    for var in shift_vars.values():
+        if not is_fixed(var):
+            model.AddHint(var, solver.Value(var))
+    total_solver = configure_solver(SolveOptions(num_workers=1, max_time_seconds=max_time_seconds))
+    total_solver.parameters.fix_variables_to_their_hinted_value = True
+    status = total_solver.Solve(model)
+    return total_solver, cp_model.FEASIBLE if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else status
+
+
+def solve_lexicographic(model, shift_vars, objective_terms, solve_options: Optional[SolveOptions] = None,
+                        stages=None, stage_seconds=None, report=None):
+    """
+    Optimizes the priority groups one after the other: each stage minimizes its own
+    weighted penalty, then pins it (<= the value found) before the next stage starts
+    from the incumbent roster as hints. A final stage minimizes the full weighted
+    sum under all the pins, so the returned solver reports the usual total penalty.
+    Each stage gets 'stage_seconds' (default config.LEXICOGRAPHIC_STAGE_SECONDS), capped
+    by what is left of solve_options.max_time_seconds, the budget of the whole run; the
+    stages left once it is spent are skipped.
+    Returns (solver, status) of the final stage. If the run stops earlier (budget spent,
+    or a stage finds no roster) the last roster found is kept and re-solved with its
+    shifts ('shift_vars') fixed, see total_of_incumbent: the result is FEASIBLE with the
+    roster's total penalty, never one stage's partial penalty.
+    """
+    solve_options = solve_options or SolveOptions()
+    stage_seconds = config.LEXICOGRAPHIC_STAGE_SECONDS if stage_seconds is None else stage_seconds
+    remaining = solve_options.max_time_seconds
+    report = report or RunReport()
+    results = report.details.setdefault('lexicographic', [])
+
+    last = None
+    for terms in lexicographic_stages(objective_terms, stages) + [objective_terms]:
+        if remaining is not None and remaining <= 0 and last:
+            print("⏱️ Time budget spent; skipping the remaining lexicographic stages.")
+            return total_of_incumbent(model, objective_terms, last[0], shift_vars, stage_seconds)
+        keys = sorted({key for _, key in terms})
+        expression = objective_expression(terms)
+        model.Minimize(expression)
+        budget = stage_seconds if remaining is None else min(stage_seconds, max(remaining, 0))
+        solver, status = solve(model, replace(solve_options, max_time_seconds=budget, target_objective=None))
+        if remaining is not None:
+            # Deterministic runs are limited in deterministic time, so they are budgeted in it too
+            remaining -= solver.DeterministicTime() if solve_options.deterministic else solver.WallTime()
+        results.append({'keys': keys, 'status': solver.StatusName(status), 'seconds': solver.WallTime(),
+                        'objective': solver.ObjectiveValue() if status in (cp_model.OPTIMAL,
+                                                                           cp_model.FEASIBLE) else None})
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            if not last:
+                return solver, status
+            return total_of_incumbent(model, objective_terms, last[0], shift_vars, stage_seconds)
+        last = solver, status
+        print(f"  Stage {len(results)} ({', '.join(keys) if terms is not objective_terms else 'all'}): "
+              f"{solver.ObjectiveValue():g} ({solver.StatusName(status)}, {solver.WallTime():.2f}s)")
+        model.Add(expression <= int(solver.ObjectiveValue()))
+        hint_solution(model, solver)
+
+    return last
+
+
+def replay_roster(employees, assignment, report=None):
+    """
+    Rebuilds the model with every cell fixed to 'assignment' ((employees x days x shifts)),
+    so a roster found outside CP-SAT gets a regular (solver, status, shift_vars) for the
+    writers. Only propagation is left for the solver: milliseconds. INFEASIBLE means the
+    roster breaks a hard rule, unavailability and forced shifts included.
+    """
+    report = report or RunReport()
+    frozen = {cell: int(value) for cell, value in np.ndenumerate(assignment)}
+    with report.phase('build'):
+        model, shift_vars, objective_terms = build_model_terms(employees, report=report, frozen=frozen)
+        set_objective(model, objective_terms)
+    with report.phase('replay'):
+        solver, status = solve(model, SolveOptions(num_workers=1))
+    return solver, status, shift_vars
+
+
+def build_and_solve_model(employees, solve_options: Optional[SolveOptions] = None, previous_roster=None,
+                          encoding=None, report=None, lexicographic=None):
+    """
+    Builds the weekly model (see build_model) and solves it with 'solve_options'.
+    With 'lexicographic' (default config.LEXICOGRAPHIC_OBJECTIVE) the penalty groups
+    are optimized in priority order instead (see solve_lexicographic).
+
+    A greedy roster (construction.construct_roster) warm-starts the search when no
+    'previous_roster' is given (config.CONSTRUCTION_HINTS), and is returned instead when
+    the time budget runs out without a solution (config.CONSTRUCTION_FALLBACK), with status
+    FEASIBLE and report.details['fallback'] set.
+    Timings, model size and solver statistics are recorded into 'report' when given.
+    """
+    report = report or RunReport()
+    if lexicographic is None:
+        lexicographic = config.LEXICOGRAPHIC_OBJECTIVE
+
+    built = None
+    if config.CONSTRUCTION_HINTS or config.CONSTRUCTION_FALLBACK:
+        with report.phase('construction'):
+            built = construction.construct_roster(employees)
+        report.details['construction'] = {'seconds': built.seconds, 'complete': built.complete,
+                                          'unfilled': built.unfilled}
+        if previous_roster is None and config.CONSTRUCTION_HINTS:
+            previous_roster = roster_from_array(employees, built.assignment)
+
+    with report.phase('build'):
+        model, shift_vars, objective_terms = build_model_terms(employees, previous_roster=previous_roster,
+                                                               encoding=encoding, report=report)
+        with report.phase('objective'):
+            set_objective(model, objective_terms)
+    report.record_model(model)
+    print(f"🧱 Model built in {report.phases['build']['seconds']:.3f}s "
+          f"({report.details['model']['variables']} variables, "
+          f"{report.details['model']['constraints']} constraints)")
+
+    with report.phase('solve'):
+        if lexicographic:
+            solver, status = solve_lexicographic(model, shift_vars, objective_terms, solve_options, report=report)
+        else:
+            solver, status = solve(model, solve_options)
+    report.record_solver(solver, status)
+
+    if status == cp_model.UNKNOWN and config.CONSTRUCTION_FALLBACK and built and built.complete:
+        print("⏱️ No solution within the time budget; falling back to the greedy roster.")
+        solver, replay_status, shift_vars = replay_roster(employees, built.assignment, report)
+        if replay_status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            # The replay is 'optimal' only for its fixed cells; the roster itself is just feasible
+            status = cp_model.FEASIBLE
+            report.details['fallback'] = 'construction'
+
+    return solver, status, shift_vars
+
+
+def compare_encodings(employees, solve_options: Optional[SolveOptions] = None):
+    """
+    Builds and solves the same instance with every soft-constraint encoding and
+    prints model size, timings and objective, checking that the optima agree.
+    """
+    results = {}
+    for encoding in ENCODINGS:
+        start = time.perf_counter()
+        model, shift_vars = build_model(employees, encoding=encoding)
+        build_time = time.perf_counter() - start
+
+        solver, status = solve(model, solve_options)
+        proto = model.Proto()
+        results[encoding] = {
+            'variables': len(proto.variables),
+            'constraints': len(proto.constraints),
+            'build_seconds': build_time,
+            'solve_seconds': solver.WallTime(),
+            'optimal': status == cp_model.OPTIMAL,
+            'objective': solver.ObjectiveValue() if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else None
+        }
+
+    print(f"{'Encoding':<10}{'Vars':>8}{'Cons':>8}{'Build(s)':>10}{'Solve(s)':>10}{'Objective':>12}")
+    for encoding, r in results.items():
+        print(f"{encoding:<10}{r['variables']:>8}{r['constraints']:>8}{r['build_seconds']:>10.3f}"
+              f"{r['solve_seconds']:>10.3f}{str(r['objective']):>12}")
+
+    lean, reified = results['lean'], results['reified']
+    if lean['optimal'] and reified['optimal']:
+        if lean['objective'] == reified['objective']:
+            print("✅ Both encodings reach the same optimum.")
+        else:
+            print("❌ Objective mismatch between encodings!")
+    else:
+        print("⚠️ At least one run stopped before proving optimality; objectives are not comparable.")
+
+    return results
+
+
+def compare_symmetry_breaking(employees, solve_options: Optional[SolveOptions] = None):
+    """
+    Solves the same instance with and without symmetry breaking and prints the number
+    of equivalence groups, solve times and objectives.
+    """
+    results = {}
+    for enabled in (False, True):
+        report = RunReport()
+        model, shift_vars = build_model(employees, report=report, symmetry_breaking=enabled)
+        solver, status = solve(model, solve_options)
+        results[enabled] = {
+            'groups': report.details.get('symmetry', {}).get('groups', 0),
+            'solve_seconds': solver.WallTime(),
+            'optimal': status == cp_model.OPTIMAL,
+            'objective': solver.ObjectiveValue() if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else None
+        }
+
+    print(f"{'Symmetry':<10}{'Groups':>8}{'Solve(s)':>10}{'Objective':>12}")
+    for enabled, r in results.items():
+        print(f"{'on' if enabled else 'off':<10}{r['groups']:>8}{r['solve_seconds']:>10.3f}{str(r['objective']):>12}")
+    return results
+
+
+def compare_lexicographic(employees, solve_options: Optional[SolveOptions] = None):
+    """
+    Solves the same instance with the blended objective and in lexicographic stages
+    and prints the time and the penalty of every priority group for both.
+    """
+    results = {}
+    for lexicographic in (False, True):
+        report = RunReport()
+        model, shift_vars, objective_terms = build_model_terms(employees, report=report)
+        set_objective(model, objective_terms)
+        start = time.perf_counter()
+        if lexicographic:
+            solver, status = solve_lexicographic(model, shift_vars, objective_terms, solve_options, report=report)
+        else:
+            solver, status = solve(model, solve_options)
+        feasible = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        results[lexicographic] = {
+            'solve_seconds': time.perf_counter() - start,
+            'objective': solver.ObjectiveValue() if feasible else None,
+            'breakdown': penalty_breakdown(solver, objective_terms) if feasible else {}
+        }
+
+    groups = config.LEXICOGRAPHIC_STAGES
+    print(f"{'Mode':<15}{'Solve(s)':>10}{'Objective':>12}" + "".join(f"{'+'.join(g)[:24]:>26}" for g in groups))
+    for lexicographic, r in results.items():
+        values = [sum(r['breakdown'].get(key, 0) for key in group) for group in groups]
+        print(f"{'lexicographic' if lexicographic else 'blended':<15}{r['solve_seconds']:>10.3f}"
+              f"{str(r['objective']):>12}" + "".join(f"{value:>26g}" for value in values))
+    return results
+
+
+if __name__ == "__main__":
+    team = employee_store.load_employees()
+    compare_encodings(team, SolveOptions(num_workers=8, max_time_seconds=60))
+    compare_symmetry_breaking(team, SolveOptions(num_workers=8, max_time_seconds=60))
+    compare_lexicographic(team, SolveOptions(num_workers=8, max_time_seconds=60))
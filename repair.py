@@ -0,0 +1,242 @@
+# repair.py
+import argparse
+import copy
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+import config
+import employee_store
+import export_writer
+import optimizer
+from run_report import RunReport, report_path_for
+
+
+@dataclass
+class RosterDelta:
+    """What changed since the roster was published."""
+    # New unavailable cells per employee id (e.g. a sick call)
+    unavailable: Dict[int, List[Tuple[int, int]]] = field(default_factory=dict)
+    # Employees who left; they keep the shifts they already worked
+    removed: List[int] = field(default_factory=list)
+    # First day that can still change; earlier days are in the past and stay as published
+    from_day: int = 0
+
+
+@dataclass
+class RosterChange:
+    """One cell of the published roster that the repair changed."""
+    employee_id: int
+    name: str
+    day: int
+    shift: int
+    change: str  # 'added' or 'removed'
+
+    def __str__(self):
+        sign = '+' if self.change == 'added' else '-'
+        return f"{sign} {self.name}: Day {self.day}, Shift {self.shift}"
+
+
+def load_published_roster(path):
+    """
+    Reads a roster table written by export_writer ('*_roster.csv' or '*_roster.jsonl')
+    into {employee_id: set of (day, shift)}.
+    """
+    roster = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.endswith('.jsonl'):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    for row in rows:
+        roster.setdefault(int(row['employee_id']), set()).add((int(row['day']), int(row['shift'])))
+    return roster
+
+
+def apply_delta(employees, delta: RosterDelta, num_days, num_shifts):
+    """
+    Returns a copy of the employees with the delta applied to the open days: new unavailable
+    cells are added (and dropped from the forced ones), removed employees become unavailable
+    from delta.from_day on. Past days are left alone.
+    """
+    employees = copy.deepcopy(employees)
+    open_cells = [(d, s) for d in range(delta.from_day, num_days) for s in range(num_shifts)]
+
+    for emp in employees:
+        if emp.id in delta.removed:
+            blocked = set(open_cells)
+        else:
+            blocked = {(d, s) for d, s in delta.unavailable.get(emp.id, []) if d >= delta.from_day}
+        if not blocked:
+            continue
+        emp.state.unavailable_shifts = sorted(set(emp.state.unavailable_shifts) | blocked)
+        emp.state.forced_shifts = [cell for cell in emp.state.forced_shifts if cell not in blocked]
+    return employees
+
+
+def published_array(employees, published, num_days, num_shifts):
+    """The published roster as a dense (employees x days x shifts) uint8 array."""
+    assignment = np.zeros((len(employees), num_days, num_shifts), dtype=np.uint8)
+    for e_idx, emp in enumerate(employees):
+        for day, shift in published.get(emp.id, ()):
+            if 0 <= day < num_days and 0 <= shift < num_shifts:
+                assignment[e_idx, day, shift] = 1
+    return assignment
+
+
+def affected_days(employees, current, delta: RosterDelta):
+    """Days on which a published shift is no longer possible after the delta."""
+    days = set()
+    for e_idx, emp in enumerate(employees):
+        blocked = set(emp.state.unavailable_shifts)
+        for day, shift in zip(*np.nonzero(current[e_idx])):
+            if day >= delta.from_day and (day, shift) in blocked:
+                days.add(int(day))
+    return days
+
+
+def roster_diff(employees, before, after):
+    """The cells that differ between two (employees x days x shifts) arrays, as RosterChange entries."""
+    changes = []
+    for e_idx, day, shift in zip(*np.nonzero(before != after)):
+        emp = employees[e_idx]
+        changes.append(RosterChange(emp.id, emp.name, int(day), int(shift),
+                                    'added' if after[e_idx, day, shift] else 'removed'))
+    return changes
+
+
+def build_repair_model(employees, current, open_days, report):
+    """
+    The weekly model with every cell outside 'open_days' frozen to the published roster,
+    plus a ROSTER_CHANGE penalty for every open cell that differs from it.
+    Returns (model, shift_vars).
+    """
+    num_employees, num_days, num_shifts = current.shape
+    frozen = {(e, d, s): int(current[e, d, s])
+              for e in range(num_employees) for d in range(num_days) if d not in open_days
+              for s in range(num_shifts)}
+
+    # Symmetry breaking would fight the published order of interchangeable employees
+    model, shift_vars, objective_terms = optimizer.build_model_terms(
+        employees, report=report, symmetry_breaking=False, frozen=frozen
+    )
+
+    with report.phase('roster_change', model):
+        for (e, d, s), var in shift_vars.items():
+            if optimizer.is_fixed(var):
+                continue
+            published = bool(current[e, d, s])
+            model.AddHint(var, published)
+            objective_terms.append((var.Not() if published else var, 'ROSTER_CHANGE'))
+
+    with report.phase('objective'):
+        optimizer.set_objective(model, objective_terms)
+    return model, shift_vars
+
+
+def repair_roster(employees, published, delta: RosterDelta, neighborhood_days=None,
+                  solve_options: Optional[optimizer.SolveOptions] = None, report=None):
+    """
+    Minimal-change re-solve of a published roster ({employee_id: set of (day, shift)}) after 'delta'.
+
+    Only the days within 'neighborhood_days' (default config.REPAIR_NEIGHBORHOOD_DAYS) of a
+    broken assignment are re-optimized; past days and the rest of the roster stay frozen.
+    If that neighborhood has no feasible repair it is widened a day at a time, up to every open day.
+    Returns (solver, status, shift_vars, employees, changes) where 'employees' has the delta
+    applied and 'changes' lists the RosterChange entries against the published roster.
+    """
+    num_days, num_shifts = config.NUM_DAYS, config.NUM_SHIFTS
+    radius = config.REPAIR_NEIGHBORHOOD_DAYS if neighborhood_days is None else neighborhood_days
+    solve_options = solve_options or optimizer.SolveOptions(max_time_seconds=config.REPAIR_MAX_TIME_SECONDS)
+    report = report or RunReport()
+
+    employees = apply_delta(employees, delta, num_days, num_shifts)
+    current = published_array(employees, published, num_days, num_shifts)
+    broken_days = affected_days(employees, current, delta)
+    report.details['repair'] = {'affected_days': sorted(broken_days), 'attempts': []}
+
+    while True:
+        open_days = {d + offset for d in broken_days for offset in range(-radius, radius + 1)}
+        open_days = {d for d in open_days if delta.from_day <= d < num_days}
+
+        with report.phase('build'):
+            model, shift_vars = build_repair_model(employees, current, open_days, report)
+        with report.phase('solve'):
+            solver, status = optimizer.solve(model, solve_options)
+
+        report.details['repair']['attempts'].append({'open_days': sorted(open_days),
+                                                     'status': solver.StatusName(status)})
+        all_open = len(open_days) == num_days - delta.from_day
+        if status != cp_model.INFEASIBLE or all_open or not broken_days:
+            break
+        radius += 1
+        print(f"🔧 No repair within the neighborhood; widening it to ±{radius} days.")
+
+    report.record_model(model)
+    report.record_solver(solver, status)
+
+    changes = []
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        repaired = optimizer.solution_array(solver, shift_vars, len(employees), num_days, num_shifts)
+        changes = roster_diff(employees, current, repaired)
+    report.details['repair']['changes'] = [str(change) for change in changes]
+    return solver, status, shift_vars, employees, changes
+
+
+def print_changes(changes):
+    if not changes:
+        print("✅ The published roster still holds; nothing changed.")
+        return
+    print(f"🔧 {len(changes)} cell(s) changed:")
+    for change in changes:
+        print(f"   {change}")
+
+
+def parse_cell_arg(text):
+    """'employee_id:day:shift' -> (employee_id, (day, shift))."""
+    emp_id, day, shift = (int(part) for part in text.split(':'))
+    return emp_id, (day, shift)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Repair a published roster after a mid-week change.")
+    parser.add_argument('published', help="roster table written by export_writer (*_roster.csv or .jsonl)")
+    parser.add_argument('--unavailable', action='append', default=[], metavar='ID:DAY:SHIFT',
+                        help="a newly unavailable cell, repeatable")
+    parser.add_argument('--remove', action='append', type=int, default=[], metavar='ID',
+                        help="an employee who is no longer available, repeatable")
+    parser.add_argument('--from-day', type=int, default=0, help="first day that may still change")
+    parser.add_argument('--neighborhood', type=int, default=None,
+                        help="days around each broken assignment to re-optimize (default: config)")
+    parser.add_argument('--output-prefix', default=export_writer.DEFAULT_OUTPUT_PREFIX + "_repaired")
+    args = parser.parse_args()
+
+    unavailable = {}
+    for text in args.unavailable:
+        emp_id, cell = parse_cell_arg(text)
+        unavailable.setdefault(emp_id, []).append(cell)
+    delta = RosterDelta(unavailable=unavailable, removed=args.remove, from_day=args.from_day)
+
+    report = RunReport()
+    solver, status, shift_vars, employees, changes = repair_roster(
+        employee_store.load_employees(), load_published_roster(args.published), delta,
+        neighborhood_days=args.neighborhood, report=report
+    )
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        print(f"\n✅ Repaired in {solver.WallTime():.3f}s. Cost (Penalty): {solver.ObjectiveValue()}")
+        print_changes(changes)
+        export_writer.write_outputs(config.OUTPUT_FORMATS, solver, shift_vars, employees,
+                                    config.NUM_DAYS, config.NUM_SHIFTS,
+                                    xlsx_path=args.output_prefix + ".xlsx", output_prefix=args.output_prefix,
+                                    report=report)
+    else:
+        print("\n❌ No repair found, even with every open day re-optimized.")
+    report.write(report_path_for(args.output_prefix + ".xlsx"))
+
+
+if __name__ == "__main__":
+    main()
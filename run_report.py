@@ -0,0 +1,89 @@
+# run_report.py
+import contextlib
+import json
+import os
+import time
+
+
+class RunReport:
+    """
+    Collects per-phase timings, model size per constraint family and CP-SAT
+    statistics for one run, and writes them as a JSON file.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.solver_stats = {}
+        self.details = {}
+
+    @contextlib.contextmanager
+    def phase(self, name, model=None):
+        """
+        Times a block and accumulates it under 'name'; when 'model' is given the
+        variables and constraints created inside the block are counted too.
+        Re-entering the same phase (e.g. once per employee) adds up.
+        """
+        entry = self.phases.setdefault(name, {'seconds': 0.0, 'variables': 0, 'constraints': 0})
+        if model is not None:
+            proto = model.Proto()
+            num_vars, num_cons = len(proto.variables), len(proto.constraints)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry['seconds'] += time.perf_counter() - start
+            if model is not None:
+                entry['variables'] += len(proto.variables) - num_vars
+                entry['constraints'] += len(proto.constraints) - num_cons
+
+    def record_model(self, model):
+        """Stores the final model size."""
+        proto = model.Proto()
+        self.details['model'] = {
+            'variables': len(proto.variables),
+            'constraints': len(proto.constraints)
+        }
+
+    def record_solver(self, solver, status):
+        """Stores the CP-SAT response statistics of a finished solve."""
+        response = solver.ResponseProto()
+        self.solver_stats = {
+            'status': solver.StatusName(status),
+            'objective': response.objective_value,
+            'best_bound': response.best_objective_bound,
+            'branches': response.num_branches,
+            'conflicts': response.num_conflicts,
+            'restarts': response.num_restarts,
+            'binary_propagations': response.num_binary_propagations,
+            'integer_propagations': response.num_integer_propagations,
+            'lp_iterations': response.num_lp_iterations,
+            'wall_time': response.wall_time,
+            'user_time': response.user_time,
+            'deterministic_time': response.deterministic_time,
+            # Size of the model after presolve, to compare with details['model']
+            'presolved_integers': response.num_integers,
+            'presolved_booleans': response.num_booleans,
+            'fixed_booleans': response.num_fixed_booleans,
+            'solution_info': response.solution_info
+        }
+
+    def to_dict(self):
+        return {
+            'phases': self.phases,
+            'solver': self.solver_stats,
+            **self.details
+        }
+
+    def write(self, path):
+        """Writes the report as JSON to 'path'."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"📝 Run report written to '{path}'.")
+
+
+def report_path_for(output_path):
+    """'.../schedule.xlsx' -> '.../schedule_report.json'."""
+    return os.path.splitext(output_path)[0] + "_report.json"
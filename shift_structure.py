@@ -0,0 +1,234 @@
+# shift_structure.py
+import math
+from dataclasses import dataclass
+from typing import List, Optional
+
+import config
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _to_minutes(hhmm):
+    hours, minutes = hhmm.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+@dataclass(frozen=True)
+class ShiftType:
+    """One shift of the day: its label, its hours ('HH:MM'; an end before the start runs past midnight) and tags."""
+    name: str
+    start: str
+    end: str
+    night: bool = False
+    morning: bool = False
+
+    @property
+    def start_minute(self):
+        return _to_minutes(self.start)
+
+    @property
+    def duration_minutes(self):
+        duration = _to_minutes(self.end) - self.start_minute
+        return duration if duration > 0 else duration + MINUTES_PER_DAY
+
+    @property
+    def kind(self):
+        """'night', 'morning' or 'evening' (untagged): the bucket used by the min/max preferences."""
+        if self.night:
+            return 'night'
+        if self.morning:
+            return 'morning'
+        return 'evening'
+
+
+def shift_type_from_dict(data: dict) -> ShiftType:
+    return ShiftType(**data)
+
+
+def even_shift_types(num_shifts, first_start="07:00"):
+    """
+    Splits the day into 'num_shifts' equal shifts starting at 'first_start';
+    the first is tagged morning and the last night. With 3 shifts this is
+    the default 07-15 / 15-23 / 23-07 day.
+    """
+    length = MINUTES_PER_DAY // num_shifts
+    start = _to_minutes(first_start)
+    shift_types = []
+    for s in range(num_shifts):
+        begin = (start + s * length) % MINUTES_PER_DAY
+        end = (begin + length) % MINUTES_PER_DAY
+        shift_types.append(ShiftType(
+            name=f"Shift {s + 1}",
+            start=f"{begin // 60:02d}:{begin % 60:02d}",
+            end=f"{end // 60:02d}:{end % 60:02d}",
+            night=num_shifts > 1 and s == num_shifts - 1,
+            morning=s == 0
+        ))
+    return shift_types
+
+
+class ShiftStructure:
+    """
+    The planning horizon (num_days, starting on a Sunday) and the shift types of
+    every day, plus the rules derived from real hours:
+
+    - two shifts closer than config.MIN_REST_HOURS apart can never both be worked (hard);
+    - two shifts closer than config.PREFERRED_REST_HOURS apart cost a REST_GAP penalty;
+    - weekly preferences are applied per period of config.PREFS_PERIOD_DAYS days.
+
+    Rest pairs are stored as (first shift, second shift, day offset), so every
+    rule expands to a constant number of constraints per day of the horizon.
+    """
+
+    def __init__(self, shift_types: List[ShiftType], num_days: int):
+        self.shift_types = list(shift_types)
+        self.num_days = num_days
+        self.num_shifts = len(self.shift_types)
+
+        # Shifts are listed in order through the working day, so a start earlier than
+        # the previous one (e.g. a 01:00 shift after a 19:00 one) falls after midnight
+        self._starts = []
+        for shift_type in self.shift_types:
+            start = shift_type.start_minute
+            while self._starts and start < self._starts[-1]:
+                start += MINUTES_PER_DAY
+            self._starts.append(start)
+
+        self._hard_pairs = set(self.hard_rest_pairs())
+
+    # --- Shift types ---
+
+    def shifts_of_kind(self, kind):
+        return [s for s, shift_type in enumerate(self.shift_types) if shift_type.kind == kind]
+
+    def last_shift_of_kind(self, kind):
+        """Latest-ending shift of a kind (used for last week's 'noon' and 'night' flags), or None."""
+        shifts = self.shifts_of_kind(kind)
+        if not shifts:
+            return None
+        return max(shifts, key=lambda s: self._end(s))
+
+    def _start(self, s):
+        return self._starts[s]
+
+    def _end(self, s):
+        return self._start(s) + self.shift_types[s].duration_minutes
+
+    # --- Rest between shifts ---
+
+    def gap_minutes(self, first, second, day_offset):
+        """Minutes from the end of shift 'first' on day d to the start of 'second' on day d + day_offset."""
+        return day_offset * MINUTES_PER_DAY + self._start(second) - self._end(first)
+
+    def rest_pairs(self, max_hours, min_hours=0):
+        """
+        (first, second, day offset >= 1) of every two shifts on different days whose rest
+        is shorter than 'max_hours' but at least 'min_hours'. Same-day pairs are left out:
+        one shift per day is a hard rule anyway.
+        """
+        longest = max(shift_type.duration_minutes for shift_type in self.shift_types)
+        max_offset = math.ceil((max_hours * 60 + longest) / MINUTES_PER_DAY) + 1
+        pairs = []
+        for offset in range(1, max_offset + 1):
+            for first in range(self.num_shifts):
+                for second in range(self.num_shifts):
+                    gap = self.gap_minutes(first, second, offset)
+                    if min_hours * 60 <= gap < max_hours * 60:
+                        pairs.append((first, second, offset))
+        return pairs
+
+    def hard_rest_pairs(self):
+        return self.rest_pairs(config.MIN_REST_HOURS)
+
+    def short_rest_pairs(self):
+        return self.rest_pairs(config.PREFERRED_REST_HOURS, config.MIN_REST_HOURS)
+
+    def too_close(self, cell, other):
+        """True if one employee cannot work both (day, shift) cells: same day or too little rest."""
+        (d1, s1), (d2, s2) = sorted([tuple(cell), tuple(other)])
+        if d1 == d2:
+            return True
+        return (s1, s2, d2 - d1) in self._hard_pairs
+
+    # --- Carry-over from the previous horizon ---
+
+    def previous_shifts(self, state):
+        """Last week's final shifts as (day, shift) cells on days -1 / -2, from the WeeklyState flags."""
+        night = self.last_shift_of_kind('night')
+        noon = self.last_shift_of_kind('evening')
+        cells = []
+        if state.worked_last_fri_night and night is not None:
+            cells.append((-2, night))
+        if state.worked_last_sat_night and night is not None:
+            cells.append((-1, night))
+        if state.worked_last_sat_noon and noon is not None:
+            cells.append((-1, noon))
+        return cells
+
+    def _carry_over(self, state, pairs):
+        cells = set()
+        for day, shift in self.previous_shifts(state):
+            for first, second, offset in pairs:
+                if first == shift and 0 <= day + offset < self.num_days:
+                    cells.add((day + offset, second))
+        return cells
+
+    def carry_over_blocked(self, state):
+        """Cells ruled out by too little rest after last week's final shifts (hard)."""
+        return self._carry_over(state, self.hard_rest_pairs())
+
+    def carry_over_short_rest(self, state):
+        """Cells that would follow last week's final shifts with a short (penalized) rest, sorted."""
+        return sorted(self._carry_over(state, self.short_rest_pairs()))
+
+    @staticmethod
+    def history_nights(state):
+        """Consecutive nights worked up to the end of last week (0, 1 or 2)."""
+        if not state.worked_last_sat_night:
+            return 0
+        return 2 if state.worked_last_fri_night else 1
+
+    # --- Preference periods ---
+
+    def periods(self):
+        """Day ranges over which the weekly preferences apply: config.PREFS_PERIOD_DAYS each, the last may be shorter."""
+        length = config.PREFS_PERIOD_DAYS
+        return [range(start, min(start + length, self.num_days)) for start in range(0, self.num_days, length)]
+
+    def period_of(self, day):
+        return day // config.PREFS_PERIOD_DAYS
+
+    @staticmethod
+    def scale(value, period):
+        """A weekly preference prorated to a (possibly shorter) period."""
+        length = config.PREFS_PERIOD_DAYS
+        return value if len(period) == length else round(value * len(period) / length)
+
+    # --- Labels ---
+
+    def day_names(self):
+        """Weekday labels; horizons longer than a week number the weeks ('ראשון 2')."""
+        names = config.WEEKDAY_NAMES
+        if self.num_days <= len(names):
+            return names[:self.num_days]
+        return [f"{names[d % len(names)]} {d // len(names) + 1}" for d in range(self.num_days)]
+
+    def shift_names(self):
+        return [shift_type.name for shift_type in self.shift_types]
+
+
+def current_structure(num_days=None, num_shifts=None, shift_types: Optional[List[dict]] = None):
+    """
+    The ShiftStructure of the current settings: config.SHIFT_TYPES over config.NUM_DAYS.
+    When 'num_shifts' does not match the configured shift types (e.g. synthetic
+    benchmark instances), the day is split evenly instead.
+    """
+    num_days = num_days or config.NUM_DAYS
+    num_shifts = num_shifts or config.NUM_SHIFTS
+    shift_types = config.SHIFT_TYPES if shift_types is None else shift_types
+
+    if len(shift_types) == num_shifts:
+        types = [shift_type_from_dict(data) for data in shift_types]
+    else:
+        types = even_shift_types(num_shifts)
+    return ShiftStructure(types, num_days)
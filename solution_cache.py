@@ -0,0 +1,197 @@
+# solution_cache.py
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, fields
+from typing import Optional
+
+from ortools.sat.python import cp_model
+
+import config
+import optimizer
+import repair
+from run_report import RunReport
+
+# Bump when the model changes in a way the fingerprint cannot see (new rules, new encodings)
+CACHE_VERSION = 1
+
+# config.py settings the model reads
+MODEL_SETTINGS = (
+    'NUM_DAYS', 'NUM_SHIFTS', 'SHIFT_TYPES', 'SHIFTS_PER_DAY_DEMAND', 'DEMAND', 'WEIGHTS',
+    'MIN_REST_HOURS', 'PREFERRED_REST_HOURS', 'MAX_CONSECUTIVE_DAYS', 'MAX_CONSECUTIVE_NIGHTS',
+    'PREFS_PERIOD_DAYS', 'SOFT_CONSTRAINT_ENCODING', 'SYMMETRY_BREAKING',
+    'LEXICOGRAPHIC_OBJECTIVE', 'LEXICOGRAPHIC_STAGES', 'LEXICOGRAPHIC_STAGE_SECONDS',
+    'CONSTRUCTION_HINTS', 'CONSTRUCTION_FALLBACK',
+)
+
+# Statuses worth storing, by the name kept in an entry
+STORED_STATUSES = {'OPTIMAL': cp_model.OPTIMAL, 'FEASIBLE': cp_model.FEASIBLE}
+
+# SolveOptions fields that are hooks rather than search parameters
+_HOOKS = ('log_search_progress', 'log_callback', 'on_solution')
+
+
+def _employee_inputs(emp):
+    """What the model reads from one employee; cell lists are sorted so their order does not matter."""
+    state = {key: sorted(map(list, value)) if isinstance(value, list) else value
+             for key, value in asdict(emp.state).items()}
+    return {'id': emp.id, 'is_active': emp.is_active, 'prefs': asdict(emp.prefs), 'state': state}
+
+
+def _digest(data):
+    text = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def fingerprint(employees, solve_options: Optional[optimizer.SolveOptions] = None):
+    """
+    Returns (key, shape_key). 'key' hashes everything the solve depends on: the employees'
+    prefs and state, the model settings of config.py and the search parameters of
+    'solve_options'. 'shape_key' only hashes the team and the horizon, so an entry with the
+    same shape but another key (a near-hit) still fits the model as warm-start hints.
+    """
+    solve_options = solve_options or optimizer.SolveOptions()
+    options = {f.name: getattr(solve_options, f.name) for f in fields(solve_options) if f.name not in _HOOKS}
+    shape = {
+        'version': CACHE_VERSION,
+        'employees': sorted(emp.id for emp in employees),
+        'num_days': config.NUM_DAYS,
+        'num_shifts': config.NUM_SHIFTS,
+    }
+    full = {
+        **shape,
+        'employees': [_employee_inputs(emp) for emp in employees],
+        'settings': {name: getattr(config, name) for name in MODEL_SETTINGS},
+        'options': options,
+    }
+    return _digest(full), _digest(shape)
+
+
+class SolutionCache:
+    """
+    Solved rosters on disk, one JSON file per fingerprint. Reading an entry refreshes its
+    modification time, and the least recently used entries are evicted once there are more
+    than 'max_entries' or they take more than 'max_bytes' together.
+    """
+
+    def __init__(self, directory=None, max_entries=None, max_bytes=None):
+        self.directory = directory or config.SOLUTION_CACHE_DIR
+        self.max_entries = max_entries or config.SOLUTION_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or config.SOLUTION_CACHE_MAX_BYTES
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _entries(self):
+        """(path, mtime, size) of every entry, least recently used first."""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                entries.append((path, stat.st_mtime, stat.st_size))
+        return sorted(entries, key=lambda entry: entry[1])
+
+    def _read(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+        entry['roster'] = {int(emp_id): {tuple(cell) for cell in cells} for emp_id, cells in entry['roster'].items()}
+        return entry
+
+    def get(self, key):
+        """The entry stored under 'key', or None."""
+        path = self._path(key)
+        return self._read(path) if os.path.exists(path) else None
+
+    def nearest(self, shape_key):
+        """The most recently used entry for the same team and horizon, or None."""
+        for path, _, _ in reversed(self._entries()):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    matches = json.load(f).get('shape_key') == shape_key
+            except (OSError, ValueError):
+                continue
+            if matches:
+                return self._read(path)
+        return None
+
+    def put(self, key, shape_key, status, objective, roster, solver_stats=None):
+        """
+        Stores a roster ({employee_id: set of (day, shift)}) with the status, objective and
+        RunReport solver statistics of its solve, and evicts entries over the limits.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {
+            'key': key,
+            'shape_key': shape_key,
+            'status': status,
+            'objective': objective,
+            'solver': solver_stats or {},
+            'created': time.time(),
+            'roster': {str(emp_id): sorted(map(list, cells)) for emp_id, cells in roster.items()},
+        }
+        # Write-then-rename, so a concurrent reader never sees half an entry
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            path, _, size = entries.pop(0)
+            os.remove(path)
+            total -= size
+
+
+def cached_solve(employees, solve_options: Optional[optimizer.SolveOptions] = None, previous_roster=None,
+                 report=None, cache: Optional[SolutionCache] = None):
+    """
+    optimizer.build_and_solve_model behind the solution cache. A hit replays the stored
+    roster without searching and returns the status it was stored with; a near-hit (same
+    team and horizon, other inputs) warm-starts the solve from the stored roster instead
+    of 'previous_roster'. OPTIMAL and FEASIBLE results are stored, greedy fallback rosters
+    are not. Returns (solver, status, shift_vars) like build_and_solve_model.
+    """
+    report = report or RunReport()
+    cache = cache or SolutionCache()
+
+    with report.phase('cache_lookup'):
+        key, shape_key = fingerprint(employees, solve_options)
+        entry = cache.get(key)
+        near = None if entry else cache.nearest(shape_key)
+    report.details['cache'] = {'key': key, 'result': 'hit' if entry else 'near_hit' if near else 'miss'}
+
+    if entry:
+        print(f"♻️ Cache hit: replaying the stored roster ({entry['status']}, penalty {entry['objective']:g}).")
+        current = repair.published_array(employees, entry['roster'], config.NUM_DAYS, config.NUM_SHIFTS)
+        solver, replay_status, shift_vars = optimizer.replay_roster(employees, current, report)
+        if replay_status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            # The all-fixed replay only carries shift_vars; status and statistics are the original solve's
+            report.solver_stats = entry.get('solver') or {'status': entry['status'], 'objective': entry['objective']}
+            return solver, STORED_STATUSES[entry['status']], shift_vars
+        print("⚠️ The stored roster no longer fits the model; solving again.")
+
+    if near:
+        print("💡 Near cache hit: warm-starting from a stored roster of the same team.")
+        previous_roster = near['roster']
+
+    solver, status, shift_vars = optimizer.build_and_solve_model(
+        employees, solve_options=solve_options, previous_roster=previous_roster, report=report
+    )
+    # A greedy fallback roster is not a solve result; the next run should search again
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) and not report.details.get('fallback'):
+        assignment = optimizer.solution_array(solver, shift_vars, len(employees), config.NUM_DAYS, config.NUM_SHIFTS)
+        cache.put(key, shape_key, solver.StatusName(status), solver.ObjectiveValue(),
+                  optimizer.roster_from_array(employees, assignment), solver_stats=report.solver_stats)
+    return solver, status, shift_vars
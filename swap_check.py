@@ -0,0 +1,375 @@
+# swap_check.py
+import argparse
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+import config
+import demand as demand_rules
+import employee_store
+import optimizer
+import repair
+import shift_structure
+
+KINDS = ('night', 'morning', 'evening')
+# Per kind: (max preference, min preference, max weight, min weight)
+KIND_RULES = {kind: (max_field, min_field, max_key, min_key)
+              for kind, max_field, min_field, max_key, min_key in optimizer.KIND_PREFERENCES}
+
+
+@dataclass
+class Swap:
+    """
+    employee_a hands over 'cell_a' to employee_b; with 'cell_b' employee_a takes
+    employee_b's cell in return (a two-way swap), without it employee_b just picks the shift up.
+    """
+    employee_a: int
+    cell_a: Tuple[int, int]
+    employee_b: int
+    cell_b: Optional[Tuple[int, int]] = None
+
+    def describe(self, names):
+        """Readable form, with 'names' mapping employee ids to names."""
+        a, b = names[self.employee_a], names[self.employee_b]
+        if self.cell_b is None:
+            return f"{a} gives Day {self.cell_a[0]}, Shift {self.cell_a[1]} to {b}"
+        return (f"{a} (Day {self.cell_a[0]}, Shift {self.cell_a[1]}) <-> "
+                f"{b} (Day {self.cell_b[0]}, Shift {self.cell_b[1]})")
+
+
+@dataclass
+class SwapResult:
+    swap: Swap
+    valid: bool
+    violations: List[str] = field(default_factory=list)
+    # Change of the weighted soft penalty (negative: the roster gets better)
+    penalty_delta: float = 0.0
+
+
+class SwapChecker:
+    """
+    Checks shift swaps against a solved roster without re-solving.
+
+    Per-employee counters (shifts per day, per period and per kind, nights per day)
+    are kept next to the (employees x days x shifts) assignment, so a swap is checked
+    against every hard rule of the weekly model (availability and forced cells,
+    one shift per day, minimum rest, streak, max_shifts) by looking only at the
+    cells, windows and periods it touches: O(1) per rule, O(days) for the streak.
+    Demand is untouched by construction, since a swap never changes a cell's head count.
+
+    The soft-penalty delta re-evaluates only the penalty terms that contain a touched
+    cell, with the weights of config.WEIGHTS (or 'weights'). 'availability' re-uses an
+    optimizer.build_availability result instead of computing it again.
+    """
+
+    def __init__(self, employees, assignment, num_days=None, num_shifts=None, weights=None, availability=None):
+        self.employees = employees
+        self.index = {emp.id: e_idx for e_idx, emp in enumerate(employees)}
+        self.weights = weights or config.WEIGHTS
+        self.structure = shift_structure.current_structure(num_days, num_shifts)
+        self.demand = demand_rules.demand_matrix(self.structure.num_days, self.structure.num_shifts)
+        num_days, num_shifts = self.structure.num_days, self.structure.num_shifts
+        self.num_days = num_days
+
+        self.x = np.asarray(assignment, dtype=bool).copy()
+        self.periods = self.structure.periods()
+        self.kind_of = np.array([KINDS.index(t.kind) for t in self.structure.shift_types])
+        self.night_shifts = self.structure.shifts_of_kind('night')
+        self.window = config.MAX_CONSECUTIVE_DAYS + 1
+        self.night_window = config.MAX_CONSECUTIVE_NIGHTS + 1
+
+        # Cells each employee may work / must work (the availability pre-pass of the model)
+        fixed = availability
+        if fixed is None:
+            fixed = optimizer.build_availability(employees, num_days, num_shifts)
+        self.allowed = np.ones_like(self.x)
+        self.forced = np.zeros_like(self.x)
+        for (e, d, s), value in fixed.items():
+            if value:
+                self.forced[e, d, s] = True
+            else:
+                self.allowed[e, d, s] = False
+
+        # Rest pairs indexed by the shift on either side
+        self.hard_after, self.hard_before = self._index_pairs(self.structure.hard_rest_pairs())
+        self.short_after, self.short_before = self._index_pairs(self.structure.short_rest_pairs())
+        self.carry_short = [set(self.structure.carry_over_short_rest(emp.state)) for emp in employees]
+
+        # Counters
+        period_of_day = np.array([self.structure.period_of(d) for d in range(num_days)])
+        self.day_load = self.x.sum(axis=2)
+        self.period_total = np.zeros((len(employees), len(self.periods)), dtype=np.int64)
+        self.kind_count = np.zeros((len(employees), len(self.periods), len(KINDS)), dtype=np.int64)
+        for e, d, s in zip(*np.nonzero(self.x)):
+            self.period_total[e, period_of_day[d]] += 1
+            self.kind_count[e, period_of_day[d], self.kind_of[s]] += 1
+        self.nights = self.x[:, :, self.night_shifts].sum(axis=2)
+
+    @classmethod
+    def from_solution(cls, solver, shift_vars, employees, weights=None):
+        assignment = optimizer.solution_array(solver, shift_vars, len(employees), config.NUM_DAYS, config.NUM_SHIFTS)
+        return cls(employees, assignment, weights=weights)
+
+    def _index_pairs(self, pairs):
+        after = {s: [] for s in range(self.structure.num_shifts)}
+        before = {s: [] for s in range(self.structure.num_shifts)}
+        for first, second, offset in pairs:
+            after[first].append((second, offset))
+            before[second].append((first, offset))
+        return after, before
+
+    # --- Counters ---
+
+    def _set(self, e, cell, value):
+        d, s = cell
+        step = 1 if value else -1
+        p = self.structure.period_of(d)
+        self.x[e, d, s] = value
+        self.day_load[e, d] += step
+        self.period_total[e, p] += step
+        self.kind_count[e, p, self.kind_of[s]] += step
+        if s in self.night_shifts:
+            self.nights[e, d] += step
+
+    # --- Soft penalty terms ---
+
+    def _terms_touching(self, e, cell):
+        d, s = cell
+        p = self.structure.period_of(d)
+        terms = {('kind', p, KINDS[self.kind_of[s]]), ('target', p)}
+
+        if s in self.night_shifts:
+            for start in range(max(0, d - self.night_window + 1), min(d, self.num_days - self.night_window) + 1):
+                terms.add(('nights', start))
+            history = min(self.structure.history_nights(self.employees[e].state), self.night_window - 1)
+            if history > 0 and d < self.night_window - history:
+                terms.add(('nights_history',))
+
+        for second, offset in self.short_after[s]:
+            if d + offset < self.num_days:
+                terms.add(('rest', d, s, second, offset))
+        for first, offset in self.short_before[s]:
+            if d - offset >= 0:
+                terms.add(('rest', d - offset, first, s, offset))
+        if cell in self.carry_short[e]:
+            terms.add(('carry', d, s))
+        return terms
+
+    def _term_value(self, e, term):
+        w = self.weights
+        prefs = self.employees[e].prefs
+        name = term[0]
+
+        if name == 'kind':
+            _, p, kind = term
+            if not self.structure.shifts_of_kind(kind):
+                return 0
+            max_field, min_field, max_key, min_key = KIND_RULES[kind]
+            count = self.kind_count[e, p, KINDS.index(kind)]
+            period = self.periods[p]
+            excess = max(0, count - self.structure.scale(getattr(prefs, max_field), period))
+            shortage = max(0, self.structure.scale(getattr(prefs, min_field), period) - count)
+            return w[max_key] * excess + w[min_key] * shortage
+        if name == 'target':
+            _, p = term
+            target = self.structure.scale(prefs.target_shifts, self.periods[p])
+            return w['TARGET_SHIFTS'] * abs(int(self.period_total[e, p]) - target)
+        if name == 'nights':
+            _, start = term
+            return w['CONSECUTIVE_NIGHTS'] * bool(self.nights[e, start:start + self.night_window].all())
+        if name == 'nights_history':
+            history = min(self.structure.history_nights(self.employees[e].state), self.night_window - 1)
+            return w['CONSECUTIVE_NIGHTS'] * bool(self.nights[e, 0:self.night_window - history].all())
+        if name == 'rest':
+            _, d, first, second, offset = term
+            return w['REST_GAP'] * bool(self.x[e, d, first] and self.x[e, d + offset, second])
+        if name == 'carry':
+            _, d, s = term
+            return w['REST_GAP'] * bool(self.x[e, d, s])
+        raise ValueError(f"Unknown penalty term {term}")
+
+    def employee_penalty(self, e):
+        """Whole soft penalty of one employee (every term), used to cross-check the solver."""
+        if not self.employees[e].is_active:
+            return 0
+        terms = {('kind', p, kind) for p in range(len(self.periods)) for kind in KINDS}
+        terms |= {('target', p) for p in range(len(self.periods))}
+        for d in range(self.num_days):
+            for s in range(self.structure.num_shifts):
+                terms |= self._terms_touching(e, (d, s))
+        return sum(self._term_value(e, term) for term in terms)
+
+    def total_penalty(self):
+        """Objective of the current roster: every employee's soft penalty plus understaffing."""
+        heads = self.x.sum(axis=0)
+        understaffed = np.maximum(0, self.demand.maximum - heads)[self.demand.minimum != self.demand.maximum]
+        return (sum(self.employee_penalty(e) for e in range(len(self.employees)))
+                + self.weights['UNDERSTAFFING'] * int(understaffed.sum()))
+
+    def penalty_breakdown(self, keys=None):
+        """total_penalty split per WEIGHTS key, read from the roster itself rather than from solver slacks."""
+        weights = self.weights
+        breakdown = {}
+        try:
+            for key in keys or weights:
+                self.weights = {other: weights[other] if other == key else 0 for other in weights}
+                breakdown[key] = self.total_penalty()
+        finally:
+            self.weights = weights
+        return breakdown
+
+    # --- Hard rules ---
+
+    def _streak_ok(self, e, d):
+        """No run of working days through day 'd' longer than MAX_CONSECUTIVE_DAYS (with last week's streak)."""
+        working = self.day_load[e] > 0
+        left = 0
+        while d - left - 1 >= 0 and working[d - left - 1] and left < self.window:
+            left += 1
+        right = 0
+        while d + right + 1 < self.num_days and working[d + right + 1] and right < self.window:
+            right += 1
+        run = left + 1 + right
+        streak = self.employees[e].state.history_streak
+        if left == d and 0 < self.window - streak:
+            run += streak
+        return run < self.window
+
+    def _added_violations(self, e, cell):
+        emp = self.employees[e]
+        d, s = cell
+        p = self.structure.period_of(d)
+        where = f"Day {d}, Shift {s}"
+        if not self.allowed[e, d, s]:
+            return [f"{emp.name} cannot work {where} (unavailable, inactive or too little rest after last week)"]
+
+        violations = []
+        if self.day_load[e, d] > 1:
+            violations.append(f"{emp.name} would work two shifts on Day {d}")
+        for second, offset in self.hard_after[s]:
+            if d + offset < self.num_days and self.x[e, d + offset, second]:
+                violations.append(f"{emp.name}: too little rest between {where} and Day {d + offset}, Shift {second}")
+        for first, offset in self.hard_before[s]:
+            if d - offset >= 0 and self.x[e, d - offset, first]:
+                violations.append(f"{emp.name}: too little rest between Day {d - offset}, Shift {first} and {where}")
+        if not self._streak_ok(e, d):
+            violations.append(f"{emp.name} would work more than {config.MAX_CONSECUTIVE_DAYS} days in a row")
+        max_shifts = self.structure.scale(emp.prefs.max_shifts, self.periods[p])
+        if self.period_total[e, p] > max_shifts:
+            violations.append(f"{emp.name} would exceed max_shifts ({max_shifts})")
+        return violations
+
+    # --- Swaps ---
+
+    def _moves(self, swap: Swap):
+        """The swap as (employee index, cell, new value) steps; raises ValueError if it does not match the roster."""
+        a, b = self.index[swap.employee_a], self.index[swap.employee_b]
+        cell_a = tuple(swap.cell_a)
+        if not self.x[a][cell_a]:
+            raise ValueError(f"{self.employees[a].name} does not work Day {cell_a[0]}, Shift {cell_a[1]}")
+        if self.x[b][cell_a]:
+            raise ValueError(f"{self.employees[b].name} already works Day {cell_a[0]}, Shift {cell_a[1]}")
+        moves = [(a, cell_a, False), (b, cell_a, True)]
+
+        if swap.cell_b is not None:
+            cell_b = tuple(swap.cell_b)
+            if not self.x[b][cell_b]:
+                raise ValueError(f"{self.employees[b].name} does not work Day {cell_b[0]}, Shift {cell_b[1]}")
+            if self.x[a][cell_b]:
+                raise ValueError(f"{self.employees[a].name} already works Day {cell_b[0]}, Shift {cell_b[1]}")
+            moves = [(a, cell_a, False), (b, cell_b, False), (a, cell_b, True), (b, cell_a, True)]
+        return moves
+
+    def check(self, swap: Swap) -> SwapResult:
+        """Validates one swap and prices it, leaving the roster unchanged."""
+        try:
+            moves = self._moves(swap)
+        except ValueError as e:
+            return SwapResult(swap, False, [str(e)])
+
+        terms = {(e, term) for e, cell, _ in moves for term in self._terms_touching(e, cell)}
+        before = sum(self._term_value(e, term) for e, term in terms)
+
+        # Removals first, so a same-day swap is not seen as two shifts on one day
+        for e, cell, value in moves:
+            self._set(e, cell, value)
+
+        violations = []
+        for e, cell, value in moves:
+            if not value and self.forced[e][cell]:
+                violations.append(f"{self.employees[e].name} is forced to Day {cell[0]}, Shift {cell[1]}")
+            elif value:
+                violations.extend(self._added_violations(e, cell))
+        after = sum(self._term_value(e, term) for e, term in terms)
+
+        for e, cell, value in reversed(moves):
+            self._set(e, cell, not value)
+
+        return SwapResult(swap, not violations, violations, after - before)
+
+    def apply(self, swap: Swap) -> SwapResult:
+        """Checks a swap and, if valid, makes it part of the roster."""
+        result = self.check(swap)
+        if result.valid:
+            for e, cell, value in self._moves(swap):
+                self._set(e, cell, value)
+        return result
+
+    def candidate_swaps(self, employee_id, cell):
+        """Every swap that moves 'cell' away from the employee: give-aways and two-way swaps."""
+        a = self.index[employee_id]
+        if not self.x[a][tuple(cell)]:
+            return []
+        swaps = []
+        for b, other in enumerate(self.employees):
+            if b == a or not other.is_active or self.x[b][tuple(cell)]:
+                continue
+            swaps.append(Swap(employee_id, tuple(cell), other.id))
+            for d, s in zip(*np.nonzero(self.x[b])):
+                if not self.x[a, d, s]:
+                    swaps.append(Swap(employee_id, tuple(cell), other.id, (int(d), int(s))))
+        return swaps
+
+    def rank(self, swaps):
+        """Valid swaps first, each group sorted by penalty change (best first)."""
+        results = [self.check(swap) for swap in swaps]
+        return sorted(results, key=lambda r: (not r.valid, r.penalty_delta))
+
+
+def penalty_components(employees, assignment, keys=None, availability=None):
+    """
+    Unweighted violation count per WEIGHTS key ('keys', default all) of a roster, counted on
+    its cells rather than read from solver slacks. 'availability' as in SwapChecker.
+    """
+    unit = {key: 1 for key in config.WEIGHTS}
+    return SwapChecker(employees, assignment, weights=unit, availability=availability).penalty_breakdown(keys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check or rank shift swaps on a published roster.")
+    parser.add_argument('published', help="roster table written by export_writer (*_roster.csv or .jsonl)")
+    parser.add_argument('give', metavar='ID:DAY:SHIFT', help="the shift to hand over")
+    parser.add_argument('take', nargs='?', metavar='ID:DAY:SHIFT',
+                        help="the shift taken in return; without it every candidate swap is ranked")
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    team = employee_store.load_employees()
+    roster = repair.published_array(team, repair.load_published_roster(args.published),
+                                     config.NUM_DAYS, config.NUM_SHIFTS)
+    checker = SwapChecker(team, roster)
+    names = {emp.id: emp.name for emp in team}
+
+    giver, give_cell = repair.parse_cell_arg(args.give)
+    if args.take:
+        taker, take_cell = repair.parse_cell_arg(args.take)
+        ranked = [checker.check(Swap(giver, give_cell, taker, take_cell))]
+    else:
+        ranked = checker.rank(checker.candidate_swaps(giver, give_cell))[:args.top]
+
+    for result in ranked:
+        status = "✅" if result.valid else "❌"
+        print(f"{status} {result.swap.describe(names)}: penalty {result.penalty_delta:+g}")
+        for violation in result.violations:
+            print(f"     - {violation}")
@@ -1,101 +1,192 @@
 # update_config_file.py
+import hashlib
+import json
 import re
-from bs4 import BeautifulSoup
+import sys
+from html.parser import HTMLParser
 
+import config
+from employee_store import RESET_STATE, EmployeeStore
 
-def modify_config_file_physically(html_path, config_path):
-    """
-    Parses the Yalam HTML file and physically modifies the config.py file.
-    First, it resets specific state attributes for ALL employees.
-    Then, it updates the unavailable_shifts lists only for matching Employee IDs.
-    """
-    # --- 1. Read the existing config.py file ---
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_content = f.read()
-    except FileNotFoundError:
-        print(f"❌ Error: Could not find '{config_path}'")
-        return
-
-    # --- 2. Global Reset for ALL Employees ---
-    # Reset history_streak to 0
-    config_content = re.sub(r"(history_streak\s*=\s*)\d+", r"\g<1>0", config_content)
+# Parsed exports by content hash, so unchanged files are not parsed again
+CACHE_PATH = ".yalam_cache.json"
+CHUNK_SIZE = 64 * 1024
 
-    # Reset weekend boolean flags to False
-    config_content = re.sub(r"(worked_last_fri_night\s*=\s*)(True|False)", r"\g<1>False", config_content)
-    config_content = re.sub(r"(worked_last_sat_noon\s*=\s*)(True|False)", r"\g<1>False", config_content)
-    config_content = re.sub(r"(worked_last_sat_night\s*=\s*)(True|False)", r"\g<1>False", config_content)
+CONSTRAINT_CODE = re.compile(r"includes\('(\d{2})'\)")
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
 
-    # Reset unavailable_shifts to empty lists []
-    # (re.DOTALL is required because existing lists might span multiple lines)
-    config_content = re.sub(r"(unavailable_shifts\s*=\s*\[).*?(\])", r"\g<1>\g<2>", config_content, flags=re.DOTALL)
 
-    print("✅ Step 1: Successfully reset all employee states to default values.")
+class YalamTableParser(HTMLParser):
+    """
+    Incremental parser for the Yalam constraints table: fed in chunks, it keeps only
+    a tag stack and the current row, and collects {employee_id: [(day, shift), ...]}
+    from the direct rows of the first <tbody>.
+    Column 2 holds the employee ID, column 4 the red 'tblCircle' constraint icons.
+    """
 
-    # --- 3. Parse HTML to extract constraints per Employee ID ---
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []
+        self.tbody_depth = None
+        self.row_depth = None
+        self.col_index = -1
+        self.id_text = []
+        self.constraints = []
+        self.employee_constraints = {}
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        self.stack.append(tag)
+        depth = len(self.stack)
+
+        if tag == 'tbody' and self.tbody_depth is None:
+            self.tbody_depth = depth
+        elif tag == 'tr' and self.tbody_depth is not None and depth == self.tbody_depth + 1:
+            self.row_depth = depth
+            self.col_index = -1
+            self.id_text = []
+            self.constraints = []
+        elif tag == 'td' and self.row_depth is not None and depth == self.row_depth + 1:
+            self.col_index += 1
+        elif tag == 'i' and self.row_depth is not None and self.col_index == 4:
+            attributes = dict(attrs)
+            if 'tblCircle' in (attributes.get('class') or '').split():
+                match = CONSTRAINT_CODE.search(attributes.get('ng-if') or '')
+                if match:
+                    code = match.group(1)
+                    # Convert Yalam format to OR-Tools indices (0-indexed)
+                    self.constraints.append((int(code[0]) - 1, int(code[1]) - 1))
+
+    def handle_endtag(self, tag):
+        if tag not in self.stack:
+            return
+        # Close implicitly-closed children as well
+        while self.stack:
+            depth = len(self.stack)
+            closed = self.stack.pop()
+            if closed == 'tr' and depth == self.row_depth:
+                self._finish_row()
+            elif closed == 'tbody' and depth == self.tbody_depth:
+                self.tbody_depth = -1  # Only the first table body is read
+            if closed == tag:
+                break
+
+    def handle_data(self, data):
+        if self.row_depth is not None and self.col_index == 2:
+            self.id_text.append(data)
+
+    def _finish_row(self):
+        raw_id = "".join(self.id_text).strip()
+        if self.col_index >= 4 and raw_id.isdigit():
+            self.employee_constraints[int(raw_id)] = self.constraints
+        self.row_depth = None
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_yalam_html(html_path):
+    """Streams one Yalam export through YalamTableParser and returns {employee_id: [(day, shift)]}."""
+    parser = YalamTableParser()
+    with open(html_path, 'r', encoding='utf-8') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), ''):
+            parser.feed(chunk)
+    parser.close()
+    return parser.employee_constraints
+
+
+def _load_cache(cache_path):
     try:
-        with open(html_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
-    except FileNotFoundError:
-        print(f"❌ Error: Could not find '{html_path}'")
-        return
-
-    rows = soup.find('tbody').find_all('tr', recursive=False)
-    employee_constraints = {}
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
 
-    for row in rows:
-        cols = row.find_all('td', recursive=False)
-        if len(cols) < 5:
-            continue
 
-        raw_id = cols[2].text.strip()
-        if not raw_id.isdigit():
+def collect_constraints(html_paths, cache_path=CACHE_PATH, num_days=None):
+    """
+    Parses the weekly exports of consecutive weeks, in order, and merges them into
+    {employee_id: [(day, shift)]}: the days of the i-th file are shifted by 7 * i, so a
+    28-day horizon takes four weekly exports. Cells past 'num_days' (default
+    config.NUM_DAYS) are dropped. Files whose content hash is already in the cache are
+    not parsed again.
+    """
+    num_days = num_days or config.NUM_DAYS
+    cache = _load_cache(cache_path) if cache_path else {}
+    merged = {}
+    parsed, cached, dropped = 0, 0, 0
+
+    for week, html_path in enumerate(html_paths):
+        try:
+            digest = file_digest(html_path)
+        except FileNotFoundError:
+            print(f"❌ Error: Could not find '{html_path}'")
             continue
 
-        emp_id = int(raw_id)
-        constraints = []
-
-        # Find all red circle icons for constraints (column index 4)
-        circles = cols[4].find_all('i', class_='tblCircle')
-        for circle in circles:
-            match = re.search(r"includes\('(\d{2})'\)", circle.get('ng-if', ''))
-            if match:
-                code = match.group(1)
-                # Convert Yalam format to OR-Tools indices (0-indexed)
-                day = int(code[0]) - 1
-                shift = int(code[1]) - 1
-                constraints.append((day, shift))
-
-        employee_constraints[emp_id] = constraints
-
-    # --- 4. Apply new constraints via Regex ---
-    updated_count = 0
+        if digest in cache:
+            constraints = {int(emp_id): cells for emp_id, cells in cache[digest].items()}
+            cached += 1
+        else:
+            constraints = parse_yalam_html(html_path)
+            cache[digest] = {str(emp_id): cells for emp_id, cells in constraints.items()}
+            parsed += 1
+
+        for emp_id, cells in constraints.items():
+            employee_cells = merged.setdefault(emp_id, [])
+            for day, shift in cells:
+                day += 7 * week
+                if day >= num_days:
+                    dropped += 1
+                elif (day, shift) not in employee_cells:
+                    employee_cells.append((day, shift))
+
+    if cache_path and parsed:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+
+    print(f"📄 Read {parsed + cached} Yalam exports ({parsed} parsed, {cached} unchanged from cache).")
+    if dropped:
+        print(f"⚠️ Warning: {dropped} constraints fall after the {num_days}-day horizon and were ignored.")
+    return merged
+
+
+def import_constraints(html_paths, store_path=None, cache_path=CACHE_PATH):
+    """
+    Imports the unavailable shifts of the given Yalam exports (one per week, in order,
+    see collect_constraints) into the employee store in one transaction: ALL employees'
+    weekly state is reset first, then the unavailable_shifts lists are set for matching
+    Employee IDs.
+    """
+    employee_constraints = collect_constraints(html_paths, cache_path)
+    if not employee_constraints:
+        print("❌ Error: No constraints could be read; the employee store was not changed.")
+        return
 
-    for emp_id, constraints in employee_constraints.items():
-        if constraints:
-            # Format the list properly: "(0, 1), (2, 2)"
-            constraints_str = ", ".join([f"({d}, {s})" for d, s in constraints])
+    state_updates = {
+        emp_id: {'unavailable_shifts': constraints}
+        for emp_id, constraints in employee_constraints.items() if constraints
+    }
+    store = EmployeeStore(store_path)
+    missing = store.update_states(state_updates, reset=RESET_STATE)
 
-            # Regex targets the specific employee ID and inserts the constraints
-            # inside the newly emptied brackets "[]"
-            pattern = re.compile(
-                r"(id\s*=\s*" + str(emp_id) + r"\b.*?unavailable_shifts\s*=\s*\[)(\])",
-                re.DOTALL
-            )
+    for emp_id in missing:
+        print(f"⚠️ Warning: Employee ID {emp_id} not found in '{store.path}'.")
 
-            if pattern.search(config_content):
-                config_content = pattern.sub(r"\g<1>" + constraints_str + r"\g<2>", config_content)
-                updated_count += 1
-            else:
-                print(f"⚠️ Warning: Employee ID {emp_id} not found in config.py or structure mismatch.")
+    print("✅ Step 1: Successfully reset all employee states to default values.")
+    print(f"✅ Step 2: Updated {len(state_updates) - len(missing)} employees with new constraints in '{store.path}'.")
 
-    # --- 5. Write the modified content back to config.py ---
-    with open(config_path, 'w', encoding='utf-8') as f:
-        f.write(config_content)
 
-    print(f"✅ Step 2: Physically updated {updated_count} employees with new constraints in '{config_path}'.")
+def update_constraints_from_html(html_path, store_path=None):
+    """Single-file shortcut for import_constraints."""
+    import_constraints([html_path], store_path)
 
 
 if __name__ == "__main__":
-    # Specify the paths to your files
-    modify_config_file_physically('yalam_table.html', 'config.py')
\ No newline at end of file
+    # Usage: python update_weekly_constrains.py [week1.html week2.html ...]  (one team, consecutive weeks)
+    import_constraints(sys.argv[1:] or ['yalam_table.html'], config.EMPLOYEES_STORE)
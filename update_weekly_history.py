@@ -1,132 +1,135 @@
 # update_history.py
-import re
 import openpyxl
 
-
-def update_history_from_excel(xlsx_path, config_path):
+import config
+from employee_store import EmployeeStore
+
+# Mapping Hebrew names from the Excel to the Yalam IDs in the employee store
+NAME_TO_ID = {
+    'אירינה גונקו': 111172,
+    'אלכס קרסילניקוב': 111386,
+    'ברק טרבולסי': 106363,
+    'גלעד אלברט': 110606,
+    'גרוסברד גדי': 105744,
+    'דולב אזולאי': 108119,
+    'מיכאל פייגין': 111145,
+    'סער אליעזרי': 111046,
+    'עמינדב (בילי) בר חיים': 108520,
+    'שון בן צבי': 109350
+}
+
+# Row layout of the site export (0-indexed), per shift type
+MORNING_ROWS = [6, 8, 18]
+NOON_ROWS = [10, 12]
+NIGHT_ROWS = [14, 16]
+SHIFT_ROWS = {0: MORNING_ROWS, 1: NOON_ROWS, 2: NIGHT_ROWS}
+
+# Day columns: Sunday is column 1, Saturday is column 7
+FIRST_DAY_COL = 1
+FRI_COL = 6
+SAT_COL = 7
+
+
+# Shift type of every row that holds assignments
+ROW_TO_SHIFT = {row: shift for shift, rows in SHIFT_ROWS.items() for row in rows}
+WEEK_DAYS = SAT_COL - FIRST_DAY_COL + 1
+
+
+def index_schedule(xlsx_path, num_days=WEEK_DAYS):
     """
-    Reads the previous week's site schedule (Excel export), calculates the
-    historical streak and weekend shifts based on exact row/col indices,
-    and directly updates config.py safely without breaking tuples.
+    Streams the active sheet of the site export once, in read-only mode, and
+    returns {employee name: set of (day, shift)} (None on failure).
+    Only the rows listed in SHIFT_ROWS and the day columns are read.
     """
-
-    # Mapping Hebrew names from the Excel to the Yalam IDs in config.py
-    name_to_id = {
-        'אירינה גונקו': 111172,
-        'אלכס קרסילניקוב': 111386,
-        'ברק טרבולסי': 106363,
-        'גלעד אלברט': 110606,
-        'גרוסברד גדי': 105744,
-        'דולב אזולאי': 108119,
-        'מיכאל פייגין': 111145,
-        'סער אליעזרי': 111046,
-        'עמינדב (בילי) בר חיים': 108520,
-        'שון בן צבי': 109350
-    }
-
-    morning_rows = [6, 8, 18]
-    noon_rows = [10, 12]
-    night_rows = [14, 16]
-    all_shift_rows = morning_rows + noon_rows + night_rows
-
-    fri_col = 6
-    sat_col = 7
-
-    # --- 1. Read Excel (.xlsx) and Extract Data ---
-    csv_data = []
+    first_row, last_row = min(ROW_TO_SHIFT), max(ROW_TO_SHIFT)
+    index = {}
     try:
-        wb = openpyxl.load_workbook(xlsx_path, data_only=True)
-        sheet = wb.active
-
-        for row in sheet.iter_rows(values_only=True):
-            cleaned_row = [str(cell) if cell is not None else "" for cell in row]
-            csv_data.append(cleaned_row)
+        wb = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True)
+        try:
+            sheet = wb.active
+            rows = sheet.iter_rows(min_row=first_row + 1, max_row=last_row + 1,
+                                   max_col=FIRST_DAY_COL + num_days, values_only=True)
+            for row_idx, row in enumerate(rows, start=first_row):
+                shift = ROW_TO_SHIFT.get(row_idx)
+                if shift is None:
+                    continue
+                for day, value in enumerate(row[FIRST_DAY_COL:FIRST_DAY_COL + num_days]):
+                    if value is not None:
+                        index.setdefault(str(value).strip(), set()).add((day, shift))
+        finally:
+            wb.close()
 
         print(f"✅ Successfully read Excel file: '{xlsx_path}'.")
     except FileNotFoundError:
         print(f"❌ Error: Could not find '{xlsx_path}'. Check the file name and path.")
-        return
+        return None
     except Exception as e:
         print(f"❌ Error loading Excel file: {e}")
-        return
+        return None
 
-    history_updates = {}
+    return index
 
-    for emp_name, emp_id in name_to_id.items():
-        def is_working(row_idx, col_idx):
-            if row_idx < len(csv_data) and col_idx < len(csv_data[row_idx]):
-                return csv_data[row_idx][col_idx].strip() == emp_name
-            return False
 
-        fri_night = any(is_working(r, fri_col) for r in night_rows)
-        sat_noon = any(is_working(r, sat_col) for r in noon_rows)
-        sat_night = any(is_working(r, sat_col) for r in night_rows)
-
-        streak = 0
-        for day_col in range(7, 0, -1):
-            worked_that_day = any(is_working(r, day_col) for r in all_shift_rows)
-            if worked_that_day:
-                streak += 1
-            else:
-                break
-
-        history_updates[emp_id] = {
-            'history_streak': streak,
-            'worked_last_fri_night': fri_night,
-            'worked_last_sat_noon': sat_noon,
-            'worked_last_sat_night': sat_night
-        }
+def read_roster_from_excel(xlsx_path, num_days=WEEK_DAYS):
+    """
+    Reads the previous week's site schedule and returns the roster as
+    {employee_id: set of (day, shift)}, used to warm-start the next solve.
+    """
+    index = index_schedule(xlsx_path, num_days)
+    if index is None:
+        return {}
+    return {NAME_TO_ID[name]: cells for name, cells in index.items() if name in NAME_TO_ID}
+
+
+def history_from_cells(cells):
+    """Streak and weekend flags of one employee from the (day, shift) cells worked last week."""
+    fri, sat = FRI_COL - FIRST_DAY_COL, SAT_COL - FIRST_DAY_COL
+    worked_days = {day for day, _ in cells}
+
+    # Consecutive working days counted back from Saturday
+    streak = 0
+    for day in range(sat, -1, -1):
+        if day not in worked_days:
+            break
+        streak += 1
+
+    return {
+        'history_streak': streak,
+        'worked_last_fri_night': (fri, 2) in cells,
+        'worked_last_sat_noon': (sat, 1) in cells,
+        'worked_last_sat_night': (sat, 2) in cells
+    }
 
-    print(f"📊 Extracted history for {len(history_updates)} employees. Updating config.py...")
 
-    # --- 2. Update config.py with ROBUST Regex ---
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_content = f.read()
-    except FileNotFoundError:
-        print(f"❌ Error: Could not find '{config_path}'")
+def update_history_from_excel(xlsx_path, store_path=None):
+    """
+    Reads the previous week's site schedule (Excel export), calculates the
+    historical streak and weekend shifts based on exact row/col indices,
+    and writes them to the employee store in a single bulk update.
+    """
+    # --- 1. Read Excel (.xlsx) in one streaming pass ---
+    index = index_schedule(xlsx_path)
+    if index is None:
         return
 
-    updated_count = 0
-
-    for emp_id, state_updates in history_updates.items():
-        # חותך בלוק שלם לעובד ספציפי (עד העובד הבא או עד סוף הרשימה)
-        emp_pattern = re.compile(r"(id\s*=\s*" + str(emp_id) + r"\b.*?)(?=Employee\s*\(|\])", re.DOTALL)
-        match = emp_pattern.search(config_content)
-
-        if not match:
-            print(f"⚠️ Warning: Employee ID {emp_id} not found in config.py. Skipping.")
-            continue
-
-        emp_block = match.group(1)
-
-        for field, new_value in state_updates.items():
-            # מחפש את השדה באופן ספציפי (ללא קשר לסוגריים)
-            field_pattern = re.compile(r"\b" + field + r"\s*=\s*[A-Za-z0-9_]+")
+    history_updates = {
+        emp_id: history_from_cells(index.get(emp_name, set()))
+        for emp_name, emp_id in NAME_TO_ID.items()
+    }
 
-            if field_pattern.search(emp_block):
-                # אם השדה קיים, רק מעדכן את הערך שלו
-                emp_block = field_pattern.sub(f"{field}={new_value}", emp_block)
-            else:
-                # אם השדה לא קיים, מזריק אותו בבטחה מיד בשורה שאחרי WeeklyState(
-                emp_block = re.sub(
-                    r"(WeeklyState\s*\()",
-                    r"\g<1>\n            " + field + "=" + str(new_value) + ",",
-                    emp_block,
-                    count=1
-                )
+    print(f"📊 Extracted history for {len(history_updates)} employees. Updating the employee store...")
 
-        # מדביק את הבלוק המתוקן בחזרה לקובץ השלם
-        config_content = config_content[:match.start()] + emp_block + config_content[match.end():]
-        updated_count += 1
+    # --- 2. Update the employee store in one transaction ---
+    store = EmployeeStore(store_path)
+    missing = store.update_states(history_updates)
 
-    # --- 3. Save the modifications ---
-    with open(config_path, 'w', encoding='utf-8') as f:
-        f.write(config_content)
+    for emp_id in missing:
+        print(f"⚠️ Warning: Employee ID {emp_id} not found in '{store.path}'. Skipping.")
 
-    print(f"✅ Success: Updated history states for {updated_count} employees in '{config_path}'.")
+    print(f"✅ Success: Updated history states for {len(history_updates) - len(missing)} employees "
+          f"in '{store.path}'.")
 
 
 if __name__ == "__main__":
     excel_file_name = 'history2102.xlsx'
-    update_history_from_excel(excel_file_name, 'config.py')
\ No newline at end of file
+    update_history_from_excel(excel_file_name, config.EMPLOYEES_STORE)
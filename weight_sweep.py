@@ -0,0 +1,205 @@
+# weight_sweep.py
+import argparse
+import csv
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ortools.sat.python import cp_model
+
+import batch
+import config
+import employee_store
+import optimizer
+import swap_check
+
+DEFAULT_OUTPUT_PATH = "shift_schedule_output/weight_sweep.csv"
+
+# Model of the worker process, built once by _init_worker and re-used for every weight vector
+_worker = {}
+
+
+def weight_grid(grid, base=None):
+    """
+    Every combination of the values in 'grid' ({WEIGHTS key: [values]}); keys not in
+    the grid keep their value from 'base' (default config.WEIGHTS).
+    """
+    base = base or config.WEIGHTS
+    keys = list(grid)
+    return [{**base, **dict(zip(keys, values))} for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def random_weights(samples, keys=None, spread=4.0, seed=None, base=None):
+    """
+    'samples' weight vectors where each key in 'keys' (default: every key of 'base') is its
+    base value scaled by a log-uniform factor in [1/spread, spread], rounded to an integer.
+    """
+    base = base or config.WEIGHTS
+    keys = keys or list(base)
+    rng = random.Random(seed)
+    vectors = []
+    for _ in range(samples):
+        vector = dict(base)
+        for key in keys:
+            vector[key] = max(1, round(base[key] * spread ** rng.uniform(-1, 1)))
+        vectors.append(vector)
+    return vectors
+
+
+def pareto_front(rows, keys):
+    """Flags the rows whose penalty components (over 'keys') no other row beats on every key."""
+    vectors = [tuple(row['components'][key] for key in keys) if row['components'] else None for row in rows]
+    front = []
+    for vector in vectors:
+        if vector is None:
+            front.append(False)
+            continue
+        dominated = any(other is not None and other != vector and all(o <= v for o, v in zip(other, vector))
+                        for other in vectors)
+        front.append(not dominated)
+    return front
+
+
+def _init_worker(employees, availability, num_workers, max_time_seconds):
+    model, shift_vars, objective_terms = optimizer.build_model_terms(employees, availability=availability)
+    _worker.update(model=model, shift_vars=shift_vars, objective_terms=objective_terms,
+                   employees=employees, availability=availability, rosters=[],
+                   options=optimizer.SolveOptions(num_workers=num_workers, max_time_seconds=max_time_seconds))
+
+
+def _add_best_hints(model, shift_vars, rosters, weights):
+    """Hints the roster this worker already found that is cheapest under 'weights'."""
+    if not rosters:
+        return
+    _, assignment = min(rosters, key=lambda r: sum(weights[key] * count for key, count in r[0].items()))
+    model.ClearHints()
+    for key, var in shift_vars.items():
+        if not optimizer.is_fixed(var):
+            model.AddHint(var, bool(assignment[key]))
+
+
+def _solve_weights(index, weights):
+    """Solves the worker's model under 'weights' (only the objective changes) and returns a table row."""
+    model, shift_vars, objective_terms = _worker['model'], _worker['shift_vars'], _worker['objective_terms']
+    start = time.perf_counter()
+
+    optimizer.set_objective(model, objective_terms, weights)
+    _add_best_hints(model, shift_vars, _worker['rosters'], weights)
+    solver, status = optimizer.solve(model, _worker['options'])
+
+    row = {'index': index, 'weights': weights, 'status': solver.StatusName(status),
+           'objective': None, 'components': None, 'seconds': None}
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        # Unweighted violation counts per key, comparable across weight vectors. They are counted
+        # on the roster: slack variables of a zero-weight key (or a non-optimal solve) may overstate them
+        employees = _worker['employees']
+        assignment = optimizer.solution_array(solver, shift_vars, len(employees), config.NUM_DAYS, config.NUM_SHIFTS)
+        keys = sorted({key for _, key in objective_terms})
+        row['objective'] = solver.ObjectiveValue()
+        row['components'] = swap_check.penalty_components(employees, assignment, keys, _worker['availability'])
+        _worker['rosters'].append((row['components'], assignment))
+    row['seconds'] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def run_sweep(employees, weight_vectors, processes=None, max_time_seconds=None, output_path=DEFAULT_OUTPUT_PATH):
+    """
+    Solves the roster under every weight vector concurrently and writes one CSV row per vector:
+    its weights, the violation count per WEIGHTS key and whether that roster is Pareto-optimal
+    (no other roster of the sweep is at least as good on every key and better on one).
+
+    Each worker process builds the model once and only swaps the objective coefficients between
+    vectors, hinting the cheapest roster it has found so far under the new weights.
+    """
+    max_time_seconds = max_time_seconds or config.SOLVER_MAX_TIME_SECONDS
+    processes, workers_per_job = batch.plan_workers(len(weight_vectors), processes)
+    print(f"--- Sweeping {len(weight_vectors)} weight vectors with "
+          f"{processes} processes x {workers_per_job} CP-SAT workers ---")
+
+    # Computed once (and quietly) for every worker's model and penalty count
+    availability = optimizer.build_availability(employees, config.NUM_DAYS, config.NUM_SHIFTS, verbose=False)
+    rows = []
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(employees, availability, workers_per_job, max_time_seconds)) as pool:
+        futures = [pool.submit(_solve_weights, index, weights) for index, weights in enumerate(weight_vectors)]
+        for future in as_completed(futures):
+            row = future.result()
+            rows.append(row)
+            print(f"  #{row['index'] + 1:<4} {row['status']:<10} penalty: {row['objective']}")
+
+    rows.sort(key=lambda r: r['index'])
+    keys = sorted({key for row in rows if row['components'] for key in row['components']})
+    for row, on_front in zip(rows, pareto_front(rows, keys)):
+        row['pareto'] = on_front
+
+    write_sweep(rows, keys, output_path)
+    print_sweep(rows, keys)
+    return rows
+
+
+def write_sweep(rows, keys, output_path):
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fieldnames = (['index', 'status', 'objective', 'seconds', 'pareto']
+                  + [f"w_{key}" for key in keys] + keys)
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({
+                'index': row['index'], 'status': row['status'], 'objective': row['objective'],
+                'seconds': row['seconds'], 'pareto': row['pareto'],
+                **{f"w_{key}": row['weights'][key] for key in keys},
+                **{key: (row['components'] or {}).get(key) for key in keys}
+            })
+    print(f"✅ Weight sweep written to '{output_path}'.")
+
+
+def print_sweep(rows, keys):
+    print(f"\n{'#':>4}  {'Pareto':<7}" + "".join(f" {key:>18}" for key in keys))
+    for row in rows:
+        components = row['components'] or {}
+        print(f"{row['index'] + 1:>4}  {'*' if row['pareto'] else '':<7}"
+              + "".join(f" {components.get(key, '-'):>18}" for key in keys))
+
+
+def _parse_grid_arg(text):
+    """'KEY=1,2,4' -> ('KEY', [1, 2, 4])."""
+    key, values = text.split('=')
+    if key not in config.WEIGHTS:
+        raise argparse.ArgumentTypeError(f"Unknown WEIGHTS key '{key}'")
+    values = [int(value) for value in values.split(',')]
+    if any(value <= 0 for value in values):
+        raise argparse.ArgumentTypeError(f"Weights of '{key}' must be positive")
+    return key, values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve the roster under many WEIGHTS and compare the results.")
+    parser.add_argument('--grid', action='append', type=_parse_grid_arg, default=[], metavar='KEY=V1,V2,...',
+                        help="values to try for one WEIGHTS key, repeatable (all combinations are solved)")
+    parser.add_argument('--random', type=int, default=None, metavar='N',
+                        help="N random weight vectors around config.WEIGHTS instead of a grid "
+                             "(varying only the --grid keys when given)")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--time', type=float, default=None, help="seconds per weight vector")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_PATH)
+    args = parser.parse_args()
+
+    if args.random:
+        vectors = random_weights(args.random, keys=[key for key, _ in args.grid] or None, seed=args.seed)
+    elif args.grid:
+        vectors = weight_grid(dict(args.grid))
+    else:
+        parser.error("give --grid KEY=V1,V2,... and/or --random N")
+
+    run_sweep(employee_store.load_employees(), vectors, processes=args.processes,
+              max_time_seconds=args.time, output_path=args.output)
+
+
+if __name__ == "__main__":
+    main()